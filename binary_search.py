@@ -1,3 +1,9 @@
+import sys
+import time
+
+import numpy as np
+
+
 def search(arr, target):
     left = 0
     right = len(arr) - 1
@@ -9,14 +15,86 @@ def search(arr, target):
 	        right = mid - 1
         else:
             left = mid + 1
-    return f"not found"
+    return -1
+
+
+# Batched versions: one vectorized call for a whole array of queries.
+# `arr` must be a sorted 1-D NumPy array; the results are int64 arrays.
+
+def lower_bound(arr, queries):
+    """Index of the first element >= each query."""
+    return np.searchsorted(arr, queries, side="left")
+
+
+def upper_bound(arr, queries):
+    """Index of the first element > each query."""
+    return np.searchsorted(arr, queries, side="right")
+
+
+def count_range(arr, lo, hi):
+    """Number of elements in the closed range [lo, hi] for each pair."""
+    return np.maximum(upper_bound(arr, hi) - lower_bound(arr, lo), 0)
+
+
+def search_batch(arr, queries):
+    """Index of each query in arr, or -1 when it is missing."""
+    arr = np.asarray(arr)
+    queries = np.asarray(queries)
+    if len(arr) == 0:
+        return np.full(queries.shape, -1, dtype=np.int64)
+    idx = lower_bound(arr, queries)
+    # clip so the gather below never reads past the end
+    safe = np.minimum(idx, len(arr) - 1)
+    found = (idx < len(arr)) & (arr[safe] == queries)
+    return np.where(found, idx, -1).astype(np.int64)
+
+
+def benchmark(sizes=(10**3, 10**4, 10**5, 10**6, 10**7), n_queries=10**5):
+    rng = np.random.default_rng(0)
+    print(f"{'n':>12} {'scalar (q/s)':>16} {'batch (q/s)':>16} {'speedup':>10}")
+    for n in sizes:
+        arr = rng.integers(0, 4 * n, size=n)
+        arr.sort()  # in place, so 10^8 elements need one 800 MB array, not two
+        queries = rng.integers(0, 4 * n, size=n_queries)
+
+        start = time.perf_counter()
+        batch = search_batch(arr, queries)
+        batch_time = time.perf_counter() - start
+
+        # the scalar loop is slow, so only time a sample of the queries
+        sample = queries[:min(n_queries, 10**4)].tolist()
+        # a memoryview indexes arr as Python ints without copying it, where
+        # arr.tolist() would build n int objects (several GB at 10^8)
+        arr_view = memoryview(arr)
+        start = time.perf_counter()
+        scalar = [search(arr_view, q) for q in sample]
+        scalar_time = time.perf_counter() - start
+
+        # duplicates may resolve to different indices, so compare values
+        hits = batch[:len(sample)] != -1
+        assert np.array_equal(hits, np.array(scalar) != -1)
+        scalar_rate = len(sample) / scalar_time
+        batch_rate = n_queries / batch_time
+        print(f"{n:>12} {scalar_rate:>16,.0f} {batch_rate:>16,.0f} {batch_rate / scalar_rate:>9.1f}x")
+
+
+if __name__ == "__main__":
+    arr1 = [-2, 3, 4, 7, 8, 9, 11, 13]
+    assert search(arr1, 11) == 6
+    assert search(arr1, 13) == 7
+
+    arr2 = [3]
+    assert search(arr2, 6) == -1
+    assert search(arr2, 2) == -1
+    assert search(arr2, 3) == 0
+    print(f"Results: {search(arr1, 11)}, {search(arr1, 13)}, {search(arr2, 6)}, {search(arr2, 2)}, {search(arr2, 3)}")
 
-arr1 = [-2, 3, 4, 7, 8, 9, 11, 13]
-assert search(arr1, 11) == 6
-assert search(arr1, 13) == 7
+    batch = search_batch(np.array(arr1), np.array([11, 13, 5, -2, 20]))
+    assert batch.tolist() == [6, 7, -1, 0, -1]
+    assert count_range(np.array(arr1), 3, 9) == 5
+    print(f"Batch results: {batch.tolist()}")
 
-arr2 = [3]
-assert search(arr2, 6) == -1
-assert search(arr2, 2) == -1
-assert search(arr2, 3) == 0
-print(f"Results: {search(arr1, 11)}, {search(arr1, 13)}, {search(arr2, 6)}, {search(arr2, 2)}, {search(arr2, 3)}")
+    # pass "bench" (and optionally the largest size exponent, e.g. 8) to time it
+    if len(sys.argv) > 1 and sys.argv[1] == "bench":
+        top = int(sys.argv[2]) if len(sys.argv) > 2 else 7
+        benchmark(sizes=tuple(10**k for k in range(3, top + 1)))
@@ -1,3 +1,9 @@
+import hashlib
+import math
+import sys
+import time
+
+
 class Solution(object):
     def deleteDuplicates(self, head):
         """
@@ -5,16 +11,138 @@ class Solution(object):
         :rtype: list
         """
         head = sorted(head)  # Sort the list first
-        for i in range(len(head)-1,-1,-1):  # Iterate in reverse
-            if head[i] in head[i+1:]:  # Check for duplicates
-                del head[i]  # Remove duplicate
+        dedup_sorted(head)  # One linear pass over the sorted list
         return head  # Return updated list
 
 
-# Test the function
-head = [1, 1, 2, 3, 3,4,5,6,6]
-solution = Solution()
-new_head = solution.deleteDuplicates(head)
+def dedup_sorted(arr):
+    """Remove duplicates from a sorted list in place in O(n); returns the new length."""
+    if not arr:
+        return 0
+    write = 1
+    for read in range(1, len(arr)):
+        # sorted input: a new value is always different from the last one kept
+        if arr[read] != arr[write - 1]:
+            arr[write] = arr[read]
+            write += 1
+    del arr[write:]
+    return write
+
+
+def dedup_unsorted(items):
+    """Order-preserving dedup for unsorted, hashable input in O(n)."""
+    return list(dict.fromkeys(items))
+
+
+class BloomFilter(object):
+    """Fixed-size set approximation: no false negatives, a few false positives."""
+
+    def __init__(self, capacity, error_rate=0.001):
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item):
+        # double hashing: k positions from two 64-bit halves of one digest
+        digest = hashlib.blake2b(repr(item).encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hashes)]
+
+    def add(self, item):
+        """Add item; returns True if it was (probably) already present."""
+        present = True
+        for pos in self._positions(item):
+            byte, bit = divmod(pos, 8)
+            if not self.bits[byte] & (1 << bit):
+                present = False
+                self.bits[byte] |= 1 << bit
+        return present
+
+    def __contains__(self, item):
+        return all(self.bits[pos // 8] & (1 << (pos % 8)) for pos in self._positions(item))
+
+
+def dedup_stream(items, max_exact=1_000_000, capacity=10_000_000, error_rate=0.001):
+    """Yield each item the first time it is seen, for unbounded streams.
+
+    An exact set is used until it holds max_exact items, then its contents
+    move into a Bloom filter of the given capacity so memory stays bounded.
+    After the switch a small fraction (about error_rate) of new items may be
+    dropped as false duplicates; duplicates are never let through.
+    """
+    seen = set()
+    bloom = None
+    for item in items:
+        if bloom is None:
+            if item in seen:
+                continue
+            seen.add(item)
+            if len(seen) >= max_exact:
+                bloom = BloomFilter(capacity, error_rate)
+                for old in seen:
+                    bloom.add(old)
+                seen = None
+            yield item
+        elif not bloom.add(item):
+            yield item
+
+
+def _quadratic_dedup(head):
+    # the previous implementation, kept for the benchmark
+    head = sorted(head)
+    for i in range(len(head)-1,-1,-1):
+        if head[i] in head[i+1:]:
+            del head[i]
+    return head
+
+
+def benchmark(sizes=(10**3, 10**4, 10**5, 10**6, 10**7), quadratic_limit=10**4):
+    import random
+
+    print(f"{'n':>10} {'old O(n^2)':>12} {'sorted':>10} {'unsorted':>10} {'stream':>10}")
+    for n in sizes:
+        data = [random.randrange(n // 2 or 1) for _ in range(n)]
+        times = []
+        if n <= quadratic_limit:
+            start = time.perf_counter()
+            expected = _quadratic_dedup(data)
+            times.append(time.perf_counter() - start)
+        else:
+            expected = None
+            times.append(None)
+
+        start = time.perf_counter()
+        result = Solution().deleteDuplicates(data)
+        times.append(time.perf_counter() - start)
+        assert expected is None or result == expected
+
+        start = time.perf_counter()
+        unsorted = dedup_unsorted(data)
+        times.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        streamed = sum(1 for _ in dedup_stream(data))
+        times.append(time.perf_counter() - start)
+        assert len(unsorted) == len(result)
+        # the Bloom filter may drop a few unique items, never keep a repeat
+        assert streamed <= len(result)
+
+        cells = ["-" if t is None else f"{t:.3f}s" for t in times]
+        print(f"{n:>10} {cells[0]:>12} {cells[1]:>10} {cells[2]:>10} {cells[3]:>10}")
+
+
+if __name__ == "__main__":
+    # Test the function
+    head = [1, 1, 2, 3, 3,4,5,6,6]
+    solution = Solution()
+    new_head = solution.deleteDuplicates(head)
+
+    # Print the output
+    print("Updated List:", new_head)
+    print("Unsorted, order kept:", dedup_unsorted([3, 1, 3, 2, 1]))
+    print("Stream (Bloom after 3 items):", list(dedup_stream([5, 1, 5, 2, 7, 1, 9, 7], max_exact=3)))
 
-# Print the output
-print("Updated List:", new_head)
+    # pass "bench" to compare with the old quadratic version
+    if len(sys.argv) > 1 and sys.argv[1] == "bench":
+        benchmark()
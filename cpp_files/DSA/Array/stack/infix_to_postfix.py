@@ -1,43 +1,201 @@
+import operator
+import re
+from functools import lru_cache
+
+# operator: (precedence, right associative)
+OPERATORS = {
+    '+': (1, False),
+    '-': (1, False),
+    '*': (2, False),
+    '/': (2, False),
+    'neg': (3, True),  # unary minus, binds looser than ^ so -2^2 == -4
+    '^': (4, True),
+}
+
+BINARY_FUNCS = {
+    '+': operator.add,
+    '-': operator.sub,
+    '*': operator.mul,
+    '/': operator.truediv,
+    '^': operator.pow,
+}
+
+TOKEN_RE = re.compile(r"\s*(?:(\d+\.?\d*(?:[eE][+-]?\d+)?|\.\d+)|([A-Za-z_]\w*)|(\S))")
+
+
 def precedence(op):
-    if op == '+' or op == '-':
-        return 1
-    if op == '*' or op == '/':
-        return 2
-    return 0
+    return OPERATORS.get(op, (0, False))[0]
 
-def infix_to_postfix(expression):
+
+def tokenize(expression):
+    """Split an expression into (kind, value) tokens: num, name, op, ( and )."""
+    tokens = []
+    pos = 0
+    expression = expression.rstrip()
+    while pos < len(expression):
+        m = TOKEN_RE.match(expression, pos)
+        number, name, symbol = m.groups()
+        pos = m.end()
+        if number is not None:
+            tokens.append(('num', float(number) if any(c in number for c in '.eE') else int(number)))
+        elif name is not None:
+            tokens.append(('name', name))
+        elif symbol in '()':
+            tokens.append((symbol, symbol))
+        elif symbol in OPERATORS:
+            # a minus is unary at the start, after '(' or after another operator
+            if symbol in '+-' and (not tokens or tokens[-1][0] in ('op', '(')):
+                if symbol == '-':
+                    tokens.append(('op', 'neg'))
+                continue
+            tokens.append(('op', symbol))
+        else:
+            raise ValueError(f"unexpected character {symbol!r} at position {m.start(3)}")
+    return tokens
+
+
+def to_postfix(tokens):
     stack = []  # to keep operators
     output = [] # to build the output expression
-    for char in expression:
-        # If the character is an operand, add it to output
-        if char.isalnum():
-            output.append(char)
-        
-        # If the character is '(', push it to stack
-        elif char == '(':
-            stack.append(char)
-        
-        # If the character is ')', pop and output from the stack 
+    for kind, value in tokens:
+        # If the token is an operand, add it to output
+        if kind in ('num', 'name'):
+            output.append((kind, value))
+
+        # If the token is '(', push it to stack
+        elif kind == '(':
+            stack.append(value)
+
+        # If the token is ')', pop and output from the stack
         # until an '(' is encountered
-        elif char == ')':
+        elif kind == ')':
             while stack and stack[-1] != '(':
-                output.append(stack.pop())
+                output.append(('op', stack.pop()))
+            if not stack:
+                raise ValueError("unbalanced parentheses")
             stack.pop()  # pop '('
-        
-        # An operator is encountered
+
+        # A prefix operator waits for its operand, so it never pops anything
+        elif value == 'neg':
+            stack.append(value)
+
+        # A binary operator is encountered
         else:
+            prec, right = OPERATORS[value]
             while (stack and stack[-1] != '(' and
-                   precedence(stack[-1]) >= precedence(char)):
-                output.append(stack.pop())
-            stack.append(char)
-    
+                   (precedence(stack[-1]) > prec or
+                    (precedence(stack[-1]) == prec and not right))):
+                output.append(('op', stack.pop()))
+            stack.append(value)
+
     # pop all the operators from the stack
     while stack:
-        output.append(stack.pop())
-    return "".join(output)
-
-# Example usage
-expression = "A*(B+C)/D"
-postfix = infix_to_postfix(expression)
-print("Infix expression:", expression)
-print("Postfix expression:", postfix)
+        op = stack.pop()
+        if op == '(':
+            raise ValueError("unbalanced parentheses")
+        output.append(('op', op))
+    return output
+
+
+def infix_to_postfix(expression):
+    """Postfix form as a string; tokens are space separated once any is longer than one character."""
+    parts = [str(value) for _, value in to_postfix(tokenize(expression))]
+    parts = ['~' if p == 'neg' else p for p in parts]
+    sep = "" if all(len(p) == 1 for p in parts) else " "
+    return sep.join(parts)
+
+
+# Bytecode: the postfix tokens turned into instructions for a stack machine.
+PUSH, LOAD, NEG, BINARY = range(4)
+
+
+class CompiledExpression:
+    __slots__ = ('source', 'code', 'variables')
+
+    def __init__(self, source, code, variables):
+        self.source = source
+        self.code = code
+        self.variables = variables
+
+    def __repr__(self):
+        return f"CompiledExpression({self.source!r})"
+
+    def evaluate(self, bindings=None):
+        """Run the bytecode. Bindings may be scalars or NumPy arrays; with
+        arrays every instruction works on whole columns at once."""
+        bindings = bindings or {}
+        stack = []
+        push = stack.append
+        pop = stack.pop
+        for opcode, arg in self.code:
+            if opcode == PUSH:
+                push(arg)
+            elif opcode == LOAD:
+                try:
+                    push(bindings[arg])
+                except KeyError:
+                    raise KeyError(f"no value bound for variable {arg!r}") from None
+            elif opcode == NEG:
+                push(-pop())
+            else:
+                right = pop()
+                push(arg(pop(), right))
+        return stack[0]
+
+    __call__ = evaluate
+
+
+@lru_cache(maxsize=1024)
+def compile_expression(expression):
+    """Compile once; repeated calls with the same text hit the LRU cache."""
+    code = []
+    depth = 0
+    variables = []
+    for kind, value in to_postfix(tokenize(expression)):
+        if kind == 'num':
+            code.append((PUSH, value))
+            depth += 1
+        elif kind == 'name':
+            code.append((LOAD, value))
+            if value not in variables:
+                variables.append(value)
+            depth += 1
+        elif value == 'neg':
+            if depth < 1:
+                raise ValueError(f"missing operand in {expression!r}")
+            code.append((NEG, None))
+        else:
+            if depth < 2:
+                raise ValueError(f"missing operand in {expression!r}")
+            code.append((BINARY, BINARY_FUNCS[value]))
+            depth -= 1
+    if depth != 1:
+        raise ValueError(f"malformed expression {expression!r}")
+    return CompiledExpression(expression, tuple(code), tuple(variables))
+
+
+def evaluate(expression, **bindings):
+    return compile_expression(expression).evaluate(bindings)
+
+
+def evaluate_columns(expression, columns):
+    """Evaluate one expression over whole columns (a dict of equal-length
+    sequences, or a structured NumPy array / DataFrame indexed by name)."""
+    import numpy as np
+
+    compiled = compile_expression(expression)
+    bindings = {name: np.asarray(columns[name], dtype=np.float64) for name in compiled.variables}
+    return compiled.evaluate(bindings)
+
+
+if __name__ == "__main__":
+    # Example usage
+    expression = "A*(B+C)/D"
+    postfix = infix_to_postfix(expression)
+    print("Infix expression:", expression)
+    print("Postfix expression:", postfix)
+
+    expression = "-price^2 + 10*qty - 3"
+    print("Infix expression:", expression)
+    print("Postfix expression:", infix_to_postfix(expression))
+    print("Value at price=2, qty=4:", evaluate(expression, price=2, qty=4))
@@ -0,0 +1,351 @@
+import os
+import re
+import struct
+import sys
+import time
+
+import numpy as np
+
+# Python side of the Account log that lib01.cpp appends to transactions.log.
+#
+# read_log() streams the text log in blocks and turns each block into NumPy
+# columns (kind, amount, logged balance). A Ledger stores the same history
+# as fixed 9-byte binary records (kind + amount) in an append-only file,
+# plus a sidecar .snap file holding the balance after every
+# `snapshot_every` records. The balance after any transaction is the
+# nearest snapshot plus a replay of fewer than `snapshot_every` records,
+# so neither the current nor a historical balance needs a full re-scan.
+#
+# Balances are replayed from the amounts in order, one addition at a time,
+# exactly like Account does; lib01.cpp prints doubles with 6 significant
+# digits, so for amounts that need more digits the logged "New Balance"
+# text is rounded and the replayed value is the more precise one.
+
+DEPOSIT, WITHDRAWAL, FAILED = 0, 1, 2
+SIGN = np.array([1.0, -1.0, 0.0])
+
+LINE_RE = re.compile(
+    rb"^(Deposited: |Withdrew: |Failed Withdrawal of )(\S+?)"
+    rb"(?:, New Balance: (\S+)| \(Insufficient funds\))[ \t\r]*$",
+    re.MULTILINE,
+)
+KIND_OF_PREFIX = {b"Deposited: ": DEPOSIT, b"Withdrew: ": WITHDRAWAL, b"Failed Withdrawal of ": FAILED}
+
+RECORD = np.dtype([("kind", "u1"), ("amount", "<f8")])
+HEADER = struct.Struct("<8sdI12x")  # magic, initial balance, snapshot interval
+MAGIC = b"LEDGER1\0"
+
+
+def _parse_block(block, first_line):
+    matches = LINE_RE.findall(block)
+    if len(matches) != block.count(b"\n"):
+        _locate(block, first_line)  # a bad line, or just blank ones
+    kinds = np.fromiter((KIND_OF_PREFIX[m[0]] for m in matches), dtype=np.uint8, count=len(matches))
+    amounts = np.array([float(m[1]) for m in matches])
+    balances = np.array([float(m[2]) if m[2] else np.nan for m in matches])
+    return kinds, amounts, balances
+
+
+def _locate(block, first_line):
+    # only runs when a block has a line the block regex did not take
+    for number, line in enumerate(block.split(b"\n"), first_line):
+        if line.strip() and not LINE_RE.fullmatch(line):
+            raise ValueError(f"line {number}: unrecognized transaction {line.decode(errors='replace')!r}")
+
+
+def read_log(path, block_size=1 << 22):
+    """Yield (kinds, amounts, balances) column chunks for a transactions.log.
+
+    balances holds the logged "New Balance" and is NaN for failed withdrawals.
+    """
+    line = 1
+    with open(path, "rb") as f:
+        tail = b""
+        while True:
+            data = f.read(block_size)
+            block = tail + data
+            if data:
+                cut = block.rfind(b"\n") + 1
+                block, tail = block[:cut], block[cut:]
+            elif not block:
+                return
+            elif not block.endswith(b"\n"):
+                block += b"\n"  # last line without a newline
+            if block:
+                chunk = _parse_block(block, line)
+                line += block.count(b"\n")
+                if len(chunk[0]):
+                    yield chunk
+            if not data:
+                return
+
+
+def rescan_balance(path, i):
+    """Balance after the first i transactions, found by scanning the text log."""
+    balance = np.nan
+    seen = 0
+    for kinds, amounts, balances in read_log(path):
+        take = balances[:i - seen]
+        logged = take[~np.isnan(take)]
+        if len(logged):
+            balance = logged[-1]
+        seen += len(take)
+        if seen >= i:
+            break
+    return float(balance)
+
+
+class Ledger:
+    """Append-only binary ledger; opening an existing file ignores the
+    initial_balance and snapshot_every arguments and uses the stored ones."""
+
+    def __init__(self, path, initial_balance=0.0, snapshot_every=4096, batch_size=1000):
+        self.path = path
+        self.snap_path = path + ".snap"
+        self.batch_size = batch_size
+        self._pending_kinds = []
+        self._pending_amounts = []
+        self._pending_balance = 0.0
+        if not os.path.exists(path) or os.path.getsize(path) < HEADER.size:
+            with open(path, "wb") as f:
+                f.write(HEADER.pack(MAGIC, initial_balance, snapshot_every))
+            open(self.snap_path, "wb").close()
+        self._file = open(path, "r+b")
+        magic, self.initial_balance, self.snapshot_every = HEADER.unpack(self._file.read(HEADER.size))
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a ledger file")
+        self._recover()
+
+    def _recover(self):
+        # drop a torn record from an interrupted append, then bring the
+        # snapshots in line with the records (they are written second)
+        total = (os.path.getsize(self.path) - HEADER.size) // RECORD.itemsize
+        self._file.truncate(HEADER.size + total * RECORD.itemsize)
+        self._file.seek(0, os.SEEK_END)
+        if not os.path.exists(self.snap_path):
+            open(self.snap_path, "wb").close()
+        snapshots = np.fromfile(self.snap_path, dtype="<f8")[:total // self.snapshot_every]
+        self._snap_file = open(self.snap_path, "r+b")
+        self._snap_file.truncate(snapshots.nbytes)
+        self._snap_file.seek(0, os.SEEK_END)
+        self.snapshots = snapshots.tolist()
+        self.count = len(self.snapshots) * self.snapshot_every
+        self.balance = self.snapshots[-1] if self.snapshots else self.initial_balance
+        records = self._read(self.count, total)
+        self._advance(records["kind"], records["amount"])
+
+    def __len__(self):
+        return self.count + len(self._pending_kinds)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # -- reads -------------------------------------------------------------
+
+    def _read(self, start, stop):
+        # seek + read rather than os.pread, which Windows does not have;
+        # _append seeks back to the end before it writes
+        self._file.seek(HEADER.size + start * RECORD.itemsize)
+        return np.frombuffer(self._file.read((stop - start) * RECORD.itemsize), dtype=RECORD)
+
+    def transactions(self, start=0, stop=None):
+        """Records start..stop as a structured array with kind and amount."""
+        self.flush()
+        stop = self.count if stop is None else min(stop, self.count)
+        return self._read(start, stop)
+
+    def balance_at(self, i):
+        """Balance after the first i transactions (0 gives the opening balance)."""
+        self.flush()
+        if not 0 <= i <= self.count:
+            raise IndexError(f"ledger has {self.count} transactions, asked for {i}")
+        k = i // self.snapshot_every
+        balance = self.snapshots[k - 1] if k else self.initial_balance
+        records = self._read(k * self.snapshot_every, i)
+        return float(_replay(balance, records["kind"], records["amount"])[-1])
+
+    # -- writes ------------------------------------------------------------
+
+    def deposit(self, amount):
+        self.append(DEPOSIT, amount)
+
+    def withdraw(self, amount):
+        """Withdraw like Account::withdraw; returns False when funds are short."""
+        ok = self.current_balance() >= amount
+        self.append(WITHDRAWAL if ok else FAILED, amount)
+        return ok
+
+    def current_balance(self):
+        return self._pending_balance if self._pending_kinds else self.balance
+
+    def append(self, kind, amount):
+        if not self._pending_kinds:
+            self._pending_balance = self.balance
+        self._pending_balance += SIGN[kind] * amount
+        self._pending_kinds.append(kind)
+        self._pending_amounts.append(amount)
+        if len(self._pending_kinds) >= self.batch_size:
+            self.flush()
+
+    def extend(self, kinds, amounts):
+        """Append many records at once, e.g. columns from read_log()."""
+        self.flush()
+        self._append(np.asarray(kinds, dtype=np.uint8), np.asarray(amounts, dtype=np.float64))
+        self._sync()
+
+    def flush(self):
+        if not self._pending_kinds:
+            return
+        kinds = np.array(self._pending_kinds, dtype=np.uint8)
+        amounts = np.array(self._pending_amounts)
+        self._pending_kinds, self._pending_amounts = [], []
+        self._append(kinds, amounts)
+        self._sync()
+
+    def _append(self, kinds, amounts):
+        if not len(kinds):
+            return
+        records = np.empty(len(kinds), dtype=RECORD)
+        records["kind"], records["amount"] = kinds, amounts
+        self._file.seek(0, os.SEEK_END)
+        self._file.write(records.tobytes())
+        self._advance(kinds, amounts)
+
+    def _advance(self, kinds, amounts):
+        # update the running balance and write any snapshots now due
+        if not len(kinds):
+            return
+        balances = _replay(self.balance, kinds, amounts)
+        every = self.snapshot_every
+        first = every - self.count % every  # records until the next snapshot
+        snaps = balances[first::every]
+        self._snap_file.write(snaps.astype("<f8").tobytes())
+        self.snapshots.extend(snaps.tolist())
+        self.count += len(kinds)
+        self.balance = float(balances[-1])
+
+    def _sync(self):
+        # records first, so snapshots never get ahead of them on disk
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._snap_file.flush()
+        os.fsync(self._snap_file.fileno())
+
+    def close(self):
+        self.flush()
+        self._file.close()
+        self._snap_file.close()
+
+
+def _replay(balance, kinds, amounts):
+    # balances[j] is the balance after j records; cumsum adds left to right,
+    # so this matches adding one amount at a time
+    signed = np.empty(len(kinds) + 1)
+    signed[0] = balance
+    signed[1:] = SIGN[kinds] * amounts
+    return np.cumsum(signed)
+
+
+def import_log(log_path, ledger_path, initial_balance=None, **options):
+    """Build a ledger from a transactions.log.
+
+    The opening balance is worked out from the first logged "New Balance"
+    unless initial_balance is given.
+    """
+    if os.path.exists(ledger_path):
+        os.remove(ledger_path)
+    chunks = read_log(log_path)
+    first = next(chunks, None)
+    if initial_balance is None:
+        initial_balance = 0.0
+        if first is not None:
+            kinds, amounts, balances = first
+            ok = np.flatnonzero(~np.isnan(balances))
+            if len(ok):
+                j = ok[0]
+                initial_balance = float(balances[j] - SIGN[kinds[j]] * amounts[j])
+    ledger = Ledger(ledger_path, initial_balance, **options)
+    if first is not None:
+        ledger.extend(first[0], first[1])
+    for kinds, amounts, _ in chunks:
+        ledger.extend(kinds, amounts)
+    return ledger
+
+
+def _write_sample_log(path, n, seed=0):
+    # a random account history in lib01.cpp's format; integer amounts keep
+    # the logged balances exact
+    rng = np.random.default_rng(seed)
+    deposit = rng.random(n) < 0.5
+    amounts = rng.integers(1, 500, n).tolist()
+    balance = 1000
+    with open(path, "w") as f:
+        lines = []
+        for is_deposit, amount in zip(deposit.tolist(), amounts):
+            if is_deposit:
+                balance += amount
+                lines.append(f"Deposited: {amount}, New Balance: {balance}\n")
+            elif balance >= amount:
+                balance -= amount
+                lines.append(f"Withdrew: {amount}, New Balance: {balance}\n")
+            else:
+                lines.append(f"Failed Withdrawal of {amount} (Insufficient funds)\n")
+            if len(lines) == 100_000:
+                f.write("".join(lines))
+                lines = []
+        f.write("".join(lines))
+
+
+def benchmark(n=10**7, queries=1000):
+    import tempfile
+
+    rng = np.random.default_rng(1)
+    with tempfile.TemporaryDirectory() as tmp:
+        log_path = os.path.join(tmp, "transactions.log")
+        ledger_path = os.path.join(tmp, "transactions.ledger")
+        start = time.perf_counter()
+        _write_sample_log(log_path, n)
+        print(f"wrote {n:,} log lines in {time.perf_counter() - start:.1f}s "
+              f"({os.path.getsize(log_path) / 2**20:,.0f} MiB)")
+
+        start = time.perf_counter()
+        import_log(log_path, ledger_path).close()
+        elapsed = time.perf_counter() - start
+        print(f"import: {elapsed:.1f}s ({n / elapsed:,.0f} tx/s, "
+              f"ledger {os.path.getsize(ledger_path) / 2**20:,.0f} MiB)")
+
+        start = time.perf_counter()
+        ledger = Ledger(ledger_path)
+        balance = ledger.balance
+        print(f"open + current balance: {(time.perf_counter() - start) * 1000:.2f} ms")
+
+        points = rng.integers(0, n + 1, queries)
+        start = time.perf_counter()
+        found = [ledger.balance_at(int(i)) for i in points]
+        per_query = (time.perf_counter() - start) / queries
+        print(f"historical balance: {per_query * 1e6:,.0f} us/query")
+
+        start = time.perf_counter()
+        scanned = rescan_balance(log_path, n)
+        rescan = time.perf_counter() - start
+        print(f"full text re-scan for the current balance: {rescan:.2f}s "
+              f"({rescan / per_query:,.0f}x a ledger query)")
+        assert scanned == balance
+        for i, value in list(zip(points, found))[:3]:
+            logged = rescan_balance(log_path, int(i))
+            assert logged == value or (np.isnan(logged) and value == ledger.initial_balance)
+        ledger.close()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "bench":
+        benchmark(int(float(sys.argv[2])) if len(sys.argv) > 2 else 10**7)
+    else:
+        here = os.path.dirname(os.path.abspath(__file__))
+        with import_log(os.path.join(here, "transactions.log"), os.path.join(here, "transactions.ledger")) as ledger:
+            for i, (kind, amount) in enumerate(ledger.transactions(), 1):
+                print(f"{('deposit', 'withdrawal', 'failed withdrawal')[kind]:>17} {amount:>10g}"
+                      f"  balance {ledger.balance_at(i):g}")
@@ -0,0 +1,303 @@
+import ast
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, NamedTuple
+
+import numpy as np
+
+# Parametric curves for love.py and friends.
+#
+# A curve is a pair of vectorized functions of t. evaluate_batch() samples
+# many curves at once: curves that share the same functions (e.g. the
+# frames of an animation that only differ in their t range) are evaluated
+# together in large (curves, samples) NumPy blocks. adaptive_sample()
+# starts from a coarse grid and keeps bisecting only the segments where the
+# curve turns sharply. render_frames() writes images with the Agg backend
+# (no display needed), reusing one figure per worker process.
+
+# names a formula string may use
+FORMULA_NAMES = {name: getattr(np, name) for name in (
+    "sin", "cos", "tan", "arcsin", "arccos", "arctan", "arctan2", "sinh", "cosh", "tanh",
+    "exp", "log", "log10", "sqrt", "abs", "sign", "floor", "minimum", "maximum", "pi", "e")}
+
+
+class Curve(NamedTuple):
+    name: str
+    x: Callable
+    y: Callable
+    t0: float = 0.0
+    t1: float = 2 * np.pi
+
+    @classmethod
+    def from_formula(cls, name, x, y, t0=0.0, t1=2 * np.pi):
+        """A curve from expressions in t, e.g. Curve.from_formula("circle", "cos(t)", "sin(t)")."""
+        return cls(name, _compile_formula(x), _compile_formula(y), t0, t1)
+
+    def evaluate(self, t):
+        # constant formulas return a scalar; broadcast so x and y match t
+        t = np.asarray(t, dtype=np.float64)
+        return np.broadcast_to(self.x(t), t.shape), np.broadcast_to(self.y(t), t.shape)
+
+
+# the only syntax a formula may use: numbers, t and FORMULA_NAMES,
+# arithmetic, and calls of FORMULA_NAMES functions
+_FORMULA_NODES = (ast.Expression, ast.BinOp, ast.UnaryOp, ast.Call, ast.Name, ast.Constant, ast.Load,
+                  ast.Add, ast.Sub, ast.Mult, ast.Div, ast.FloorDiv, ast.Mod, ast.Pow, ast.UAdd, ast.USub)
+
+
+def _check_formula(source):
+    tree = ast.parse(source, mode="eval")
+    for node in ast.walk(tree):
+        if not isinstance(node, _FORMULA_NODES):
+            raise ValueError(f"{type(node).__name__} is not allowed in formula {source!r}")
+        if isinstance(node, ast.Name) and node.id != "t" and node.id not in FORMULA_NAMES:
+            raise ValueError(f"unknown name {node.id!r} in formula {source!r}")
+        if isinstance(node, ast.Constant) and type(node.value) not in (int, float):
+            raise ValueError(f"only numbers are allowed as constants in formula {source!r}")
+        if isinstance(node, ast.Call) and (not isinstance(node.func, ast.Name) or node.keywords
+                                           or not callable(FORMULA_NAMES.get(node.func.id))):
+            raise ValueError(f"only calls like sin(t) are allowed in formula {source!r}")
+        # exactly the ufunc's inputs: an extra positional argument is its
+        # `out` and would overwrite t (or a temporary) in place
+        if isinstance(node, ast.Call) and len(node.args) != FORMULA_NAMES[node.func.id].nin:
+            raise ValueError(f"{node.func.id}() takes {FORMULA_NAMES[node.func.id].nin} argument(s) "
+                             f"in formula {source!r}")
+        if isinstance(node, ast.Constant):
+            # float literals, so 9**9**9 overflows instead of building a huge int
+            node.value = float(node.value)
+    return tree
+
+
+class _Formula:
+    # a plain class rather than a lambda so curves pickle into worker processes
+    def __init__(self, source):
+        self.source = source
+        # checked against a whitelist first, so only arithmetic on t and
+        # NumPy functions ever gets evaluated
+        self.code = compile(_check_formula(source), f"<formula {source!r}>", "eval")
+
+    def __call__(self, t):
+        return eval(self.code, {"__builtins__": {}}, {**FORMULA_NAMES, "t": t})
+
+    def __reduce__(self):
+        return _Formula, (self.source,)
+
+
+def _compile_formula(source):
+    formula = _Formula(source)
+    formula(np.zeros(1))  # fail here, not halfway through a batch
+    return formula
+
+
+def _heart_x(t):
+    return 16 * np.sin(t) ** 3
+
+
+def _heart_y(t):
+    return 13 * np.cos(t) - 5 * np.cos(2 * t) - 2 * np.cos(3 * t) - np.cos(4 * t)
+
+
+HEART = Curve("heart", _heart_x, _heart_y)
+
+
+def evaluate_batch(curves, n, block=1 << 16):
+    """Sample every curve at n evenly spaced t values; returns (len(curves), 2, n).
+
+    Same-function curves are evaluated together, about `block` samples per
+    NumPy call so the temporaries stay in cache.
+    """
+    curves = list(curves)
+    out = np.empty((len(curves), 2, n))
+    groups = {}
+    for i, curve in enumerate(curves):
+        groups.setdefault((curve.x, curve.y), []).append(i)
+    unit = np.linspace(0.0, 1.0, n)
+    step = max(1, block // n)
+    for rows in groups.values():
+        curve = curves[rows[0]]
+        t0 = np.array([curves[i].t0 for i in rows])[:, None]
+        t1 = np.array([curves[i].t1 for i in rows])[:, None]
+        for j in range(0, len(rows), step):
+            t = t0[j:j + step] + (t1[j:j + step] - t0[j:j + step]) * unit
+            out[rows[j:j + step], 0], out[rows[j:j + step], 1] = curve.evaluate(t)
+    return out
+
+
+def _turns(x, y):
+    # absolute change of direction (radians) at each interior sample
+    heading = np.arctan2(np.diff(y), np.diff(x))
+    return np.abs(np.angle(np.exp(1j * np.diff(heading))))
+
+
+def adaptive_sample(curve, n_init=64, max_points=4096, max_turn=0.02, min_dt=1e-9):
+    """Sample a curve densely only where it bends.
+
+    Segments next to a sample where the direction changes by more than
+    max_turn radians are bisected, worst first, until every turn is under
+    max_turn or max_points is reached. Returns (t, x, y).
+    """
+    t = np.linspace(curve.t0, curve.t1, n_init)
+    x, y = curve.evaluate(t)
+    while len(t) < max_points:
+        turn = _turns(x, y)
+        # a segment's score is the sharper turn at either of its ends
+        score = np.zeros(len(t) - 1)
+        score[:-1] = turn
+        score[1:] = np.maximum(score[1:], turn)
+        score[np.diff(t) < min_dt * (curve.t1 - curve.t0)] = 0  # cusps: stop splitting
+        split = np.flatnonzero(score > max_turn)
+        if not len(split):
+            break
+        budget = max_points - len(t)
+        if len(split) > budget:
+            split = split[np.argsort(score[split])[-budget:]]
+        mid = (t[split] + t[split + 1]) / 2
+        mx, my = curve.evaluate(mid)
+        # each midpoint goes right after the left end of its segment
+        at = split + 1
+        t, x, y = np.insert(t, at, mid), np.insert(x, at, mx), np.insert(y, at, my)
+    return t, x, y
+
+
+# -- headless export -------------------------------------------------------
+
+_figures = {}
+
+
+def _figure(size, dpi, color, linewidth):
+    # one Agg figure per worker process and style, reused for every frame
+    key = (size, dpi, color, linewidth)
+    if key not in _figures:
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from matplotlib.figure import Figure
+
+        fig = Figure(figsize=size, dpi=dpi)
+        FigureCanvasAgg(fig)
+        ax = fig.add_axes([0, 0, 1, 1])
+        ax.set_aspect("equal")
+        ax.axis("off")
+        line, = ax.plot([], [], color=color, linewidth=linewidth)
+        _figures[key] = fig, ax, line
+    return _figures[key]
+
+
+def render(x, y, path, size=(4, 4), dpi=100, color="red", linewidth=1.5, limits=None):
+    """Draw one curve to an image file; the format comes from the extension."""
+    fig, ax, line = _figure(tuple(size), dpi, color, linewidth)
+    line.set_data(x, y)
+    if limits is None:
+        ax.relim()
+        ax.autoscale_view()
+    else:
+        ax.set_xlim(limits[0], limits[1])
+        ax.set_ylim(limits[2], limits[3])
+    fig.savefig(path)
+    return path
+
+
+def _render_chunk(args):
+    first, frames, out_dir, pattern, options = args
+    paths = []
+    for i, (x, y) in enumerate(frames, first):
+        paths.append(render(x, y, os.path.join(out_dir, pattern.format(i)), **options))
+    return paths
+
+
+def render_frames(frames, out_dir, workers=None, chunksize=25, pattern="frame_{:05d}.png", **options):
+    """Render an iterable of (x, y) frames to numbered images in out_dir.
+
+    Frames are sent to a process pool in chunks (workers=1 renders here);
+    options are passed to render(). Returns the file paths in frame order.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    chunks = []
+    chunk = []
+    for frame in frames:
+        chunk.append(frame)
+        if len(chunk) == chunksize:
+            chunks.append(chunk)
+            chunk = []
+    if chunk:
+        chunks.append(chunk)
+    jobs = [(i * chunksize, c, out_dir, pattern, options) for i, c in enumerate(chunks)]
+    if workers == 1:
+        results = map(_render_chunk, jobs)
+        return [path for paths in results for path in paths]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return [path for paths in pool.map(_render_chunk, jobs) for path in paths]
+
+
+def heartbeat(n_frames, n=2000):
+    """Frames of a beating heart: the same curve scaled by a pulse."""
+    x, y = evaluate_batch([HEART], n)[0]
+    scale = 1 + 0.15 * np.sin(np.linspace(0, 2 * np.pi, n_frames, endpoint=False)) ** 8
+    return [(x * s, y * s) for s in scale]
+
+
+def benchmark(n_curves=100_000, n=100, n_frames=200):
+    import tempfile
+
+    rng = np.random.default_rng(0)
+    starts = rng.uniform(0, np.pi, n_curves)
+    curves = [HEART._replace(t0=s, t1=s + np.pi) for s in starts]
+    start = time.perf_counter()
+    for c in curves:
+        t = np.linspace(c.t0, c.t1, n)
+        _heart_x(t), _heart_y(t)
+    loop = time.perf_counter() - start
+    start = time.perf_counter()
+    batch = evaluate_batch(curves, n)
+    batched = time.perf_counter() - start
+    assert np.allclose(batch[-1], curves[-1].evaluate(np.linspace(curves[-1].t0, curves[-1].t1, n)))
+    print(f"evaluate {n_curves:,} curves x {n:,} samples: loop {loop:.3f}s, batch {batched:.3f}s")
+
+    max_turn = 0.02
+    t, x, y = adaptive_sample(HEART, max_turn=max_turn)
+    ux, uy = HEART.evaluate(np.linspace(HEART.t0, HEART.t1, len(t)))
+    # the heart's two cusps always show up as sharp turns
+    print(f"adaptive: {len(t)} points, {(_turns(x, y) > max_turn).sum()} turns over {max_turn} rad; "
+          f"uniform with as many points: {(_turns(ux, uy) > max_turn).sum()}")
+
+    try:
+        import matplotlib
+    except ImportError:
+        print("matplotlib is not installed; skipping the export benchmark")
+        return
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    frames = heartbeat(n_frames)
+    with tempfile.TemporaryDirectory() as tmp:
+        # what love.py does, once per image
+        start = time.perf_counter()
+        for i in range(n_frames):
+            t = np.linspace(0, 2 * np.pi, 100)
+            plt.plot(16 * np.sin(t) ** 3, _heart_y(t), "red")
+            plt.axis("equal")
+            plt.axis("off")
+            plt.savefig(os.path.join(tmp, f"script_{i:05d}.png"))
+            plt.close()
+        script = time.perf_counter() - start
+        print(f"love.py style: {n_frames / script:,.1f} images/s")
+        limits = (-20, 20, -20, 16)
+        for w in (1, None):
+            start = time.perf_counter()
+            render_frames(frames, os.path.join(tmp, f"w{w}"), workers=w, limits=limits)
+            elapsed = time.perf_counter() - start
+            label = "serial" if w == 1 else f"pool of {w or os.cpu_count()}"
+            print(f"render_frames {label}: {n_frames / elapsed:,.1f} images/s "
+                  f"({script / elapsed:.1f}x)")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "bench":
+        benchmark()
+    elif len(sys.argv) > 1:
+        # python curves.py OUT_DIR [N_FRAMES]: write a heartbeat animation
+        n_frames = int(sys.argv[2]) if len(sys.argv) > 2 else 60
+        paths = render_frames(heartbeat(n_frames), sys.argv[1], limits=(-20, 20, -20, 16))
+        print(f"wrote {len(paths)} frames to {sys.argv[1]}")
+    else:
+        print("usage: curves.py OUT_DIR [N_FRAMES] | bench")
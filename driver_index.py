@@ -0,0 +1,242 @@
+import math
+import sys
+import time
+
+import numpy as np
+
+from record_store import open_store
+
+# Nearest-driver lookups over the positions in data/drivers.txt.
+#
+# Positions live in flat NumPy arrays (one slot per driver) and every slot is
+# also filed under a lat/lon grid cell. A query only computes haversine
+# distances for drivers in the rings of cells around the pickup point,
+# widening the search until the k-th best distance is closer than anything
+# in the cells not yet visited. Moving a driver touches two cell sets, so
+# updates never rebuild the index.
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEG = math.pi * EARTH_RADIUS_KM / 180
+
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    lat1, lon1, lat2, lon2 = map(np.radians, (lat1, lon1, lat2, lon2))
+    a = (np.sin((lat2 - lat1) / 2) ** 2
+         + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2)
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+
+class DriverIndex:
+    def __init__(self, cell_deg=0.01, capacity=1024):
+        self.cell_deg = cell_deg
+        self.n_lon_cells = int(round(360 / cell_deg))
+        self.lat = np.zeros(capacity)
+        self.lon = np.zeros(capacity)
+        self.available = np.zeros(capacity, dtype=bool)
+        self.ids = []
+        self.slot_of = {}
+        self.cells = {}
+        self.cell_of = []
+
+    def __len__(self):
+        return len(self.ids)
+
+    def _cell(self, lat, lon):
+        return (int(math.floor(lat / self.cell_deg)),
+                int(math.floor(lon / self.cell_deg)) % self.n_lon_cells)
+
+    def _grow(self):
+        size = len(self.lat) * 2
+        for name in ("lat", "lon", "available"):
+            old = getattr(self, name)
+            new = np.zeros(size, dtype=old.dtype)
+            new[:len(old)] = old
+            setattr(self, name, new)
+
+    def add(self, driver_id, lat, lon, available=True):
+        if driver_id in self.slot_of:
+            raise KeyError(f"driver {driver_id!r} is already indexed")
+        slot = len(self.ids)
+        if slot == len(self.lat):
+            self._grow()
+        self.lat[slot], self.lon[slot], self.available[slot] = lat, lon, available
+        self.ids.append(driver_id)
+        self.slot_of[driver_id] = slot
+        cell = self._cell(lat, lon)
+        self.cell_of.append(cell)
+        self.cells.setdefault(cell, set()).add(slot)
+
+    def update(self, driver_id, lat=None, lon=None, available=None):
+        """Move a driver and/or change availability without a rebuild."""
+        slot = self.slot_of[driver_id]
+        if available is not None:
+            self.available[slot] = available
+        if lat is None and lon is None:
+            return
+        lat = self.lat[slot] if lat is None else lat
+        lon = self.lon[slot] if lon is None else lon
+        self.lat[slot], self.lon[slot] = lat, lon
+        cell = self._cell(lat, lon)
+        old = self.cell_of[slot]
+        if cell != old:
+            self._discard(old, slot)
+            self.cells.setdefault(cell, set()).add(slot)
+            self.cell_of[slot] = cell
+
+    def _discard(self, cell, slot):
+        members = self.cells[cell]
+        members.discard(slot)
+        if not members:
+            del self.cells[cell]
+
+    def remove(self, driver_id):
+        # move the last slot into the hole so the arrays stay dense
+        slot = self.slot_of.pop(driver_id)
+        self._discard(self.cell_of[slot], slot)
+        last = len(self.ids) - 1
+        if slot != last:
+            moved = self.ids[last]
+            self._discard(self.cell_of[last], last)
+            self.lat[slot], self.lon[slot] = self.lat[last], self.lon[last]
+            self.available[slot] = self.available[last]
+            self.ids[slot] = moved
+            self.cell_of[slot] = self.cell_of[last]
+            self.slot_of[moved] = slot
+            self.cells.setdefault(self.cell_of[slot], set()).add(slot)
+        self.ids.pop()
+        self.cell_of.pop()
+
+    def _ring(self, ci, cj, r):
+        if r == 0:
+            yield ci, cj
+            return
+        for di in range(-r, r + 1):
+            steps = range(-r, r + 1) if abs(di) == r else (-r, r)
+            for dj in steps:
+                yield ci + di, (cj + dj) % self.n_lon_cells
+
+    def _ring_slots(self, ci, cj, r):
+        slots = []
+        for cell in self._ring(ci, cj, r):
+            members = self.cells.get(cell)
+            if members:
+                slots.extend(members)
+        return slots
+
+    def _clear_km(self, lat, r):
+        # anything outside rings 0..r is at least this far from the query
+        lat_max = min(abs(lat) + (r + 1) * self.cell_deg, 90.0)
+        return r * self.cell_deg * KM_PER_DEG * min(1.0, math.cos(math.radians(lat_max)))
+
+    def _scan_all(self, available_only):
+        slots = np.arange(len(self.ids))
+        return slots[self.available[slots]] if available_only else slots
+
+    def _rings_too_wide(self, r):
+        # once a ring has more cells than are occupied, scanning every driver
+        # directly is cheaper than walking empty cells (sparse or far queries)
+        return 8 * r > len(self.cells)
+
+    def nearest(self, lat, lon, k=5, available_only=True):
+        """The k closest drivers as [(driver_id, km), ...], nearest first."""
+        if not self.ids:
+            return []
+        ci, cj = self._cell(lat, lon)
+        found = np.empty(0, dtype=np.int64)
+        found_dist = np.empty(0)
+        r = 0
+        while True:
+            if self._rings_too_wide(r):
+                found = self._scan_all(available_only)
+                found_dist = haversine_km(lat, lon, self.lat[found], self.lon[found])
+                break
+            slots = np.array(self._ring_slots(ci, cj, r), dtype=np.int64)
+            if available_only and len(slots):
+                slots = slots[self.available[slots]]
+            if len(slots):
+                found = np.concatenate([found, slots])
+                found_dist = np.concatenate(
+                    [found_dist, haversine_km(lat, lon, self.lat[slots], self.lon[slots])])
+            if len(found) >= k:
+                kth = np.partition(found_dist, k - 1)[k - 1]
+                if kth <= self._clear_km(lat, r):
+                    break
+            r += 1
+        order = np.argsort(found_dist)[:k]
+        return [(self.ids[found[i]], float(found_dist[i])) for i in order]
+
+    def nearest_batch(self, lats, lons, k=5, available_only=True):
+        return [self.nearest(lat, lon, k, available_only) for lat, lon in zip(lats, lons)]
+
+    def within(self, lat, lon, radius_km, available_only=True):
+        """Drivers within radius_km, nearest first."""
+        ci, cj = self._cell(lat, lon)
+        r = 0
+        slots = []
+        while True:
+            if self._rings_too_wide(r):
+                slots = self._scan_all(False).tolist()
+                break
+            slots.extend(self._ring_slots(ci, cj, r))
+            if self._clear_km(lat, r) >= radius_km:
+                break
+            r += 1
+        slots = np.array(slots, dtype=np.int64)
+        if available_only and len(slots):
+            slots = slots[self.available[slots]]
+        dist = haversine_km(lat, lon, self.lat[slots], self.lon[slots])
+        keep = dist <= radius_km
+        slots, dist = slots[keep], dist[keep]
+        order = np.argsort(dist)
+        return [(self.ids[s], float(d)) for s, d in zip(slots[order], dist[order])]
+
+    @classmethod
+    def from_store(cls, store, **options):
+        index = cls(**options)
+        for driver in store:
+            index.add(driver.id, driver.lat, driver.lon)
+        return index
+
+
+def brute_force_nearest(index, lat, lon, k=5):
+    n = len(index)
+    dist = haversine_km(lat, lon, index.lat[:n], index.lon[:n])
+    dist[~index.available[:n]] = np.inf
+    order = np.argsort(dist)[:k]
+    return [(index.ids[s], float(dist[s])) for s in order]
+
+
+def benchmark(sizes=(10**3, 10**4, 10**5, 10**6), n_queries=200, k=5):
+    rng = np.random.default_rng(0)
+    # drivers and pickups spread over a 0.4 x 0.4 degree box around Manhattan
+    for n in sizes:
+        lats = 40.55 + 0.4 * rng.random(n)
+        lons = -74.15 + 0.4 * rng.random(n)
+        start = time.perf_counter()
+        index = DriverIndex(capacity=n)
+        for i in range(n):
+            index.add(i, lats[i], lons[i])
+        build = time.perf_counter() - start
+
+        q_lat = 40.55 + 0.4 * rng.random(n_queries)
+        q_lon = -74.15 + 0.4 * rng.random(n_queries)
+        start = time.perf_counter()
+        grid = index.nearest_batch(q_lat, q_lon, k)
+        grid_time = time.perf_counter() - start
+        start = time.perf_counter()
+        brute = [brute_force_nearest(index, a, b, k) for a, b in zip(q_lat, q_lon)]
+        brute_time = time.perf_counter() - start
+        assert all([d for _, d in g] == [d for _, d in b] for g, b in zip(grid, brute))
+        print(f"{n:>9,} drivers: build {build:.2f}s, grid {n_queries / grid_time:>9,.0f} q/s, "
+              f"brute force {n_queries / brute_time:>9,.0f} q/s")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "bench":
+        benchmark()
+    else:
+        with open_store("drivers") as drivers:
+            index = DriverIndex.from_store(drivers)
+        # Times Square
+        for driver_id, km in index.nearest(40.758, -73.9855, k=3):
+            print(f"{driver_id}: {km:.2f} km")
@@ -1,15 +1,29 @@
+import io
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
 from reportlab.lib.pagesizes import letter
 from reportlab.pdfgen import canvas
 from reportlab.lib import colors
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.platypus import SimpleDocTemplate, Paragraph
-from reportlab.lib.units import inch
+from reportlab.lib.styles import ParagraphStyle
+from reportlab.platypus import Paragraph
 
-# Function to create a 100-page PDF with a decorated first page
-def create_pdf(filename):
-    c = canvas.Canvas(filename, pagesize=letter)
-    width, height = letter
-    
+PAGES = 100
+
+DEFAULTS = {
+    "title": "Decorated First Page",
+    "subtitle": "Welcome to a beautiful PDF",
+    "paragraph": "This is a more advanced example of a decorated first page.",
+}
+
+# built once per process instead of once per document
+PARAGRAPH_STYLE = ParagraphStyle(name='Normal', fontSize=14, textColor=colors.darkblue)
+
+
+def draw_decorations(c, width, height):
+    # The parts of the first page that are the same in every document
     # Draw a decorative border around the first page
     c.setStrokeColor(colors.black)
     c.setLineWidth(4)
@@ -21,14 +35,6 @@ def create_pdf(filename):
     for i in range(0, int(width), 50):
         c.line(i, 0, i + 50, height)
 
-    # Adding a custom title with a large font size
-    c.setFont("Helvetica-Bold", 36)
-    c.drawString(100, height - 100, "Decorated First Page")
-
-    # Adding a custom subtitle with a different font style
-    c.setFont("Helvetica-Oblique", 20)
-    c.drawString(100, height - 150, "Welcome to a beautiful PDF")
-
     # Add some text in different locations
     c.setFont("Times-Roman", 12)
     c.drawString(100, height - 200, "This is the first page with decorative elements.")
@@ -41,20 +47,100 @@ def create_pdf(filename):
     c.setFillColor(colors.blue)
     c.circle(400, height - 400, 50, fill=1)
 
-    # Add some text in a paragraph style (using Paragraph from Platypus)
-    styles = getSampleStyleSheet()
-    style = ParagraphStyle(name='Normal', fontSize=14, textColor=colors.darkblue)
-    paragraph = Paragraph("This is a more advanced example of a decorated first page.", style)
-    paragraph.wrapOn(c, width - 40, height - 240)
-    paragraph.drawOn(c, 100, height - 270)
 
-    # Create the first page and then add 99 empty pages
-    c.showPage()  # This saves the first page
-    for _ in range(99):
-        c.showPage()  # Creates an empty page
+def _record_decorations(width, height):
+    # Run draw_decorations() once on a scratch canvas and keep the PDF
+    # operators it produced, with the internal names of the fonts they use
+    c = canvas.Canvas(io.BytesIO(), pagesize=(width, height))
+    c.beginForm("decorations")
+    draw_decorations(c, width, height)
+    return "\n".join(c._code), dict(c._doc.fontMapping)
+
+
+# recorded once per process instead of redrawn for every document
+DECORATIONS = _record_decorations(*letter)
+
+
+# Function to create a 100-page PDF with a decorated first page
+def create_pdf(filename, title=DEFAULTS["title"], subtitle=DEFAULTS["subtitle"],
+               paragraph=DEFAULTS["paragraph"], pages=PAGES, decorated_pages=1):
+    c = canvas.Canvas(filename, pagesize=letter)
+    width, height = letter
+
+    # The decorations go into a form XObject that every decorated page
+    # references. Its content is copied from DECORATIONS rather than drawn
+    # again; a fresh canvas registers fonts in the same order as the
+    # scratch one, so the recorded font names match (if not, draw it)
+    c.beginForm("decorations")
+    operators, fonts = DECORATIONS
+    if all(c._doc.getInternalFontName(font) == name for font, name in fonts.items()):
+        c.addLiteral(operators)
+    else:
+        draw_decorations(c, width, height)
+    c.endForm()
+
+    for page in range(pages):
+        if page < decorated_pages:
+            c.doForm("decorations")
+        if page == 0:
+            # Adding a custom title with a large font size
+            c.setFillColor(colors.black)
+            c.setFont("Helvetica-Bold", 36)
+            c.drawString(100, height - 100, title)
+
+            # Adding a custom subtitle with a different font style
+            c.setFont("Helvetica-Oblique", 20)
+            c.drawString(100, height - 150, subtitle)
+
+            # Add some text in a paragraph style (using Paragraph from Platypus)
+            para = Paragraph(paragraph, PARAGRAPH_STYLE)
+            para.wrapOn(c, width - 40, height - 240)
+            para.drawOn(c, 100, height - 270)
+        c.showPage()
 
     # Save the PDF
     c.save()
 
-# Call the function to create the decorated PDF
-create_pdf("decorated_example.pdf")
+
+def _render(record):
+    start = time.perf_counter()
+    create_pdf(**record)
+    return record["filename"], time.perf_counter() - start
+
+
+def create_pdfs(records, workers=None, chunksize=4):
+    """Render one PDF per record and yield (filename, seconds) in input order.
+
+    Each record is a dict of create_pdf arguments and must have "filename".
+    With workers=1 everything runs in this process; otherwise documents are
+    spread over a process pool (workers=None uses every CPU).
+    """
+    if workers == 1:
+        yield from map(_render, records)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        yield from pool.map(_render, records, chunksize=chunksize)
+
+
+def benchmark(n=200, workers=(1, None)):
+    import tempfile
+
+    with tempfile.TemporaryDirectory() as tmp:
+        records = [{"filename": os.path.join(tmp, f"doc_{i:05d}.pdf"),
+                    "title": f"Customer {i}"} for i in range(n)]
+        for w in workers:
+            start = time.perf_counter()
+            timings = sorted(seconds for _, seconds in create_pdfs(records, workers=w))
+            elapsed = time.perf_counter() - start
+            label = "serial" if w == 1 else f"pool of {w or os.cpu_count()}"
+            print(f"{label}: {n / elapsed:,.1f} docs/s, per doc "
+                  f"mean {sum(timings) / n * 1000:.1f} ms, p95 {timings[int(n * 0.95)] * 1000:.1f} ms, "
+                  f"max {timings[-1] * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "bench":
+        benchmark()
+    else:
+        # Call the function to create the decorated PDF
+        create_pdf("decorated_example.pdf")
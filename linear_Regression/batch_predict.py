@@ -0,0 +1,183 @@
+import csv
+import io
+import struct
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
+
+# Score a large CSV with y = X @ coef + intercept without holding it in memory.
+# The main process reads blocks of raw lines, workers parse and score them,
+# and the results are written back in input order as they come in.
+
+def _read_header(f):
+    return next(csv.reader([f.readline().decode("utf-8")]))
+
+
+def _line_blocks(f, chunksize):
+    block = []
+    for line in f:
+        block.append(line)
+        if len(block) >= chunksize:
+            yield b"".join(block)
+            block = []
+    if block:
+        yield b"".join(block)
+
+
+def _score_block(args):
+    block, x_idx, keep_idx, coef, intercept, out_format = args
+    rows = [row for row in csv.reader(io.StringIO(block.decode("utf-8"))) if row]
+    X = np.array([[float(row[i]) for i in x_idx] for row in rows]).reshape(len(rows), len(x_idx))
+    pred = X @ coef + intercept
+    if out_format == "csv":
+        out = io.StringIO()
+        writer = csv.writer(out, lineterminator="\n")
+        writer.writerows([row[i] for i in keep_idx] + [repr(p)] for row, p in zip(rows, pred.tolist()))
+        return len(rows), out.getvalue()
+    if out_format == "parquet":
+        # the same columns as CSV output; features stay numeric
+        columns = [X[:, x_idx.index(i)] if i in x_idx else [row[i] for row in rows]
+                   for i in keep_idx]
+        return len(rows), (columns, pred)
+    return len(rows), pred
+
+
+# .npy files store the shape in the header, but the row count is only known
+# at the end. Reserve a fixed-size header and rewrite it once done.
+_NPY_HEADER_LEN = 128
+
+
+def _npy_header(n):
+    header = "{'descr': '<f8', 'fortran_order': False, 'shape': (%d,), }" % n
+    body_len = _NPY_HEADER_LEN - 10
+    header = header.ljust(body_len - 1) + "\n"
+    return b"\x93NUMPY\x01\x00" + struct.pack("<H", body_len) + header.encode("latin1")
+
+
+class _Writer:
+    def __init__(self, path, out_format, header, x_cols):
+        # header is the output header: kept input columns, then the prediction
+        self.format = out_format
+        self.rows = 0
+        if out_format == "csv":
+            self.f = open(path, "w", newline="", encoding="utf-8")
+            csv.writer(self.f, lineterminator="\n").writerow(header)
+        elif out_format == "npy":
+            self.f = open(path, "wb")
+            self.f.write(_npy_header(0))
+        elif out_format == "parquet":
+            if pa is None:
+                raise ImportError("pyarrow is needed for parquet output")
+            self.schema = pa.schema(
+                [(name, pa.float64() if name in x_cols else pa.string()) for name in header[:-1]]
+                + [(header[-1], pa.float64())])
+            # created up front so an empty input still gives an (empty) file
+            self.f = pq.ParquetWriter(path, self.schema)
+        else:
+            raise ValueError(f"unknown output format: {out_format}")
+
+    def write(self, n, result):
+        self.rows += n
+        if self.format == "csv":
+            self.f.write(result)
+        elif self.format == "npy":
+            self.f.write(np.asarray(result, dtype="<f8").tobytes())
+        else:
+            columns, pred = result
+            self.f.write_table(pa.table(columns + [pred], schema=self.schema))
+
+    def close(self):
+        if self.format == "npy":
+            self.f.seek(0)
+            self.f.write(_npy_header(self.rows))
+        self.f.close()
+
+
+def _peak_rss_mb():
+    if resource is None:
+        return None
+    own = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    children = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    scale = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return own / scale, children / scale
+
+
+def predict_csv(in_path, out_path, coef, intercept, x_cols=("YearsExperience",),
+                drop_cols=(), pred_col="Predicted_Salary", chunksize=100_000,
+                workers=1, out_format=None):
+    """Score in_path chunk by chunk and write predictions to out_path.
+
+    out_format is "csv", "npy" or "parquet" and defaults to the extension of
+    out_path. CSV and parquet output keep the input columns minus drop_cols
+    and append pred_col (parquet stores x_cols and pred_col as float64, the
+    rest as text); npy output holds only the predictions. Returns a stats dict.
+    """
+    if out_format is None:
+        out_format = out_path.rsplit(".", 1)[-1].lower()
+    coef = np.atleast_1d(np.asarray(coef, dtype=np.float64))
+    start = time.perf_counter()
+
+    with open(in_path, "rb") as f:
+        header = _read_header(f)
+        x_idx = [header.index(col) for col in x_cols]
+        keep_idx = [i for i, col in enumerate(header) if col not in drop_cols]
+        out_header = [header[i] for i in keep_idx] + [pred_col]
+        writer = _Writer(out_path, out_format, out_header, x_cols)
+        jobs = ((block, x_idx, keep_idx, coef, float(intercept), out_format)
+                for block in _line_blocks(f, chunksize))
+        try:
+            if workers <= 1:
+                for job in jobs:
+                    writer.write(*_score_block(job))
+            else:
+                # keep a bounded window of chunks in flight so memory stays flat
+                with ProcessPoolExecutor(max_workers=workers) as pool:
+                    pending = deque()
+                    for job in jobs:
+                        pending.append(pool.submit(_score_block, job))
+                        if len(pending) >= 2 * workers:
+                            writer.write(*pending.popleft().result())
+                    while pending:
+                        writer.write(*pending.popleft().result())
+        finally:
+            writer.close()
+
+    elapsed = time.perf_counter() - start
+    stats = {"rows": writer.rows, "seconds": elapsed,
+             "rows_per_s": writer.rows / elapsed if elapsed else float("inf")}
+    rss = _peak_rss_mb()
+    if rss is not None:
+        stats["peak_rss_mb"], stats["peak_child_rss_mb"] = rss
+    return stats
+
+
+def print_stats(stats):
+    print(f"Scored {stats['rows']:,} rows in {stats['seconds']:.2f}s "
+          f"({stats['rows_per_s']:,.0f} rows/s)")
+    if "peak_rss_mb" in stats:
+        print(f"Peak RSS: {stats['peak_rss_mb']:.1f} MB (largest worker {stats['peak_child_rss_mb']:.1f} MB)")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 5:
+        print("usage: python batch_predict.py in.csv out.{csv,npy,parquet} slope intercept [workers]")
+        sys.exit(1)
+    workers = int(sys.argv[5]) if len(sys.argv) > 5 else 1
+    print_stats(predict_csv(sys.argv[1], sys.argv[2], float(sys.argv[3]),
+                            float(sys.argv[4]), workers=workers))
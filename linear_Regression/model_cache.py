@@ -0,0 +1,104 @@
+import hashlib
+import json
+import os
+import sys
+
+# Persisted linear-model artifacts keyed by a content hash of the training
+# CSV. Only the standard library is imported here, so loading a predictor
+# does not pull in sklearn, pandas or matplotlib.
+
+ARTIFACT_VERSION = 1
+
+
+def file_sha256(path, block_size=1 << 20):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def fingerprint(path):
+    st = os.stat(path)
+    return {"sha256": file_sha256(path), "size": st.st_size, "mtime_ns": st.st_mtime_ns}
+
+
+def is_fresh(artifact, data_path):
+    """True when the artifact was trained on the current contents of data_path."""
+    old = artifact.get("fingerprint", {})
+    try:
+        st = os.stat(data_path)
+    except OSError:
+        return False
+    if st.st_size != old.get("size"):
+        return False
+    # same size and mtime: trust it without rehashing a possibly large file
+    if st.st_mtime_ns == old.get("mtime_ns"):
+        return True
+    return file_sha256(data_path) == old.get("sha256")
+
+
+def save_artifact(artifact_path, data_path, coef, intercept, metrics=None, **extra):
+    artifact = {
+        "version": ARTIFACT_VERSION,
+        "coef": [float(v) for v in coef],
+        "intercept": float(intercept),
+        "fingerprint": fingerprint(data_path),
+        "metrics": {k: float(v) for k, v in (metrics or {}).items()},
+    }
+    artifact.update(extra)
+    # write to a temp file and rename so readers never see a partial artifact
+    tmp_path = artifact_path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(artifact, f, indent=2)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, artifact_path)
+    return artifact
+
+
+def load_artifact(artifact_path, data_path=None):
+    """Return the stored artifact, or None if missing or stale for data_path."""
+    try:
+        with open(artifact_path, encoding="utf-8") as f:
+            artifact = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if artifact.get("version") != ARTIFACT_VERSION:
+        return None
+    if data_path is not None and not is_fresh(artifact, data_path):
+        return None
+    return artifact
+
+
+class LinearPredictor:
+    __slots__ = ("coef", "intercept")
+
+    def __init__(self, coef, intercept):
+        self.coef = tuple(coef)
+        self.intercept = intercept
+
+    def predict_one(self, *features):
+        return sum(w * x for w, x in zip(self.coef, features)) + self.intercept
+
+    def predict(self, rows):
+        return [self.predict_one(*row) for row in rows]
+
+
+def load_predictor(artifact_path, data_path=None):
+    artifact = load_artifact(artifact_path, data_path)
+    if artifact is None:
+        return None
+    return LinearPredictor(artifact["coef"], artifact["intercept"])
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 3:
+        print("usage: python model_cache.py salary_model.json years [years ...]")
+        sys.exit(1)
+    predictor = load_predictor(sys.argv[1])
+    if predictor is None:
+        print(f"No usable model artifact at {sys.argv[1]}")
+        sys.exit(1)
+    for years in sys.argv[2:]:
+        print(f"Predicted Salary for {years} Years Experience: ${predictor.predict_one(float(years)):,.2f}")
@@ -0,0 +1,160 @@
+import csv
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+
+# The closed-form fit only needs n, sum_X, sum_y, sum_Xy and sum_X_squared.
+# All of them are plain sums, so they can be collected chunk by chunk and
+# added together across workers. With several features the same idea becomes
+# X^T X and X^T y, where X has a leading column of ones for the intercept.
+class RegressionAccumulator:
+    def __init__(self, n_features=1):
+        self.n_features = n_features
+        self.xtx = np.zeros((n_features + 1, n_features + 1))
+        self.xty = np.zeros(n_features + 1)
+        self.n = 0
+
+    def update(self, X, y):
+        X = np.asarray(X, dtype=np.float64).reshape(len(y), -1)
+        y = np.asarray(y, dtype=np.float64)
+        if X.shape[1] != self.n_features:
+            raise ValueError(f"expected {self.n_features} features, got {X.shape[1]}")
+        ones = np.ones((len(y), 1))
+        X = np.hstack([ones, X])
+        self.xtx += X.T @ X
+        self.xty += X.T @ y
+        self.n += len(y)
+        return self
+
+    def merge(self, other):
+        if other.n_features != self.n_features:
+            raise ValueError("cannot merge accumulators with different feature counts")
+        self.xtx += other.xtx
+        self.xty += other.xty
+        self.n += other.n
+        return self
+
+    def __add__(self, other):
+        result = RegressionAccumulator(self.n_features)
+        return result.merge(self).merge(other)
+
+    def coefficients(self):
+        """Return (coefficients, intercept) from the normal equations."""
+        if self.n == 0:
+            raise ValueError("no data has been added")
+        try:
+            beta = np.linalg.solve(self.xtx, self.xty)
+        except np.linalg.LinAlgError:
+            beta = np.linalg.lstsq(self.xtx, self.xty, rcond=None)[0]
+        return beta[1:], beta[0]
+
+    def slope_intercept(self):
+        """Single-feature fit using the same formula as without_scikit_learn.py."""
+        n = self.n
+        sum_X = self.xtx[0, 1]
+        sum_y = self.xty[0]
+        sum_Xy = self.xty[1]
+        sum_X_squared = self.xtx[1, 1]
+        m = (n * sum_Xy - sum_X * sum_y) / (n * sum_X_squared - sum_X ** 2)
+        c = (sum_y - m * sum_X) / n
+        return m, c
+
+
+def _column_indices(path, x_cols, y_col):
+    with open(path, newline="", encoding="utf-8") as f:
+        header = next(csv.reader(f))
+    try:
+        return [header.index(col) for col in x_cols], header.index(y_col)
+    except ValueError as e:
+        raise KeyError(f"column missing from {path}: {e}") from None
+
+
+def _lines_in_range(path, start, end):
+    # Yield decoded lines whose first byte lies in [start, end). A line that
+    # straddles `start` belongs to the previous range, so it is skipped.
+    with open(path, "rb") as f:
+        if start > 0:
+            f.seek(start - 1)
+            f.readline()
+        else:
+            f.readline()  # header
+        while end is None or f.tell() < end:
+            line = f.readline()
+            if not line:
+                break
+            yield line.decode("utf-8")
+
+
+def iter_csv_chunks(path, x_cols, y_col, chunksize=100_000, start=0, end=None):
+    """Yield (X, y) NumPy chunks from a CSV without loading the whole file."""
+    x_idx, y_idx = _column_indices(path, x_cols, y_col)
+    X_chunk, y_chunk = [], []
+    for row in csv.reader(_lines_in_range(path, start, end)):
+        if not row:
+            continue
+        X_chunk.append([float(row[i]) for i in x_idx])
+        y_chunk.append(float(row[y_idx]))
+        if len(y_chunk) >= chunksize:
+            yield np.array(X_chunk), np.array(y_chunk)
+            X_chunk, y_chunk = [], []
+    if y_chunk:
+        yield np.array(X_chunk), np.array(y_chunk)
+
+
+def fit_rows(rows, n_features=1, chunksize=100_000):
+    """Fit from any iterable of (x1, ..., xk, y) rows, e.g. a generator."""
+    acc = RegressionAccumulator(n_features)
+    buffer = []
+    for row in rows:
+        buffer.append(row)
+        if len(buffer) >= chunksize:
+            block = np.asarray(buffer, dtype=np.float64)
+            acc.update(block[:, :-1], block[:, -1])
+            buffer = []
+    if buffer:
+        block = np.asarray(buffer, dtype=np.float64)
+        acc.update(block[:, :-1], block[:, -1])
+    return acc
+
+
+def _fit_range(args):
+    path, x_cols, y_col, chunksize, start, end = args
+    acc = RegressionAccumulator(len(x_cols))
+    for X, y in iter_csv_chunks(path, x_cols, y_col, chunksize, start, end):
+        acc.update(X, y)
+    return acc
+
+
+def fit_csv(path, x_cols=("YearsExperience",), y_col="Salary", chunksize=100_000, workers=1):
+    """Stream a CSV into a RegressionAccumulator.
+
+    With workers > 1 the file is split into byte ranges that are read by
+    separate processes and the partial accumulators are merged. Byte splitting
+    assumes no quoted field contains a newline.
+    """
+    x_cols = tuple(x_cols)
+    if workers <= 1:
+        return _fit_range((path, x_cols, y_col, chunksize, 0, None))
+
+    size = os.path.getsize(path)
+    bounds = [size * i // workers for i in range(workers + 1)]
+    jobs = [(path, x_cols, y_col, chunksize, bounds[i], bounds[i + 1]) for i in range(workers)]
+    total = RegressionAccumulator(len(x_cols))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for acc in pool.map(_fit_range, jobs):
+            total.merge(acc)
+    return total
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("usage: python streaming_fit.py data.csv [workers]")
+        sys.exit(1)
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else 1
+    acc = fit_csv(sys.argv[1], workers=workers)
+    m, c = acc.slope_intercept()
+    print(f"Rows: {acc.n:,}")
+    print(f"Equation: Salary = {m:.2f} * Experience + {c:.2f}")
@@ -1,52 +1,83 @@
-import numpy as np
-import pandas as pd
-import matplotlib.pyplot as plt
-from sklearn.model_selection import train_test_split
-from sklearn.linear_model import LinearRegression
-from sklearn.metrics import mean_absolute_error, mean_squared_error
-
-# Load dataset
-df = pd.read_csv(r"C:\Users\sanji\Downloads\Salary_dataset.csv")
-df = df.drop('Unnamed: 0', axis=1)
-
-# Prepare data
-X = df[["YearsExperience"]]  # Independent variable
-y = df["Salary"]  # Dependent variable
-
-# Split into training and testing sets
-X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
-
-# Train Linear Regression model
-model = LinearRegression()
-model.fit(X_train, y_train)
-
-# Get parameters
-m = model.coef_[0]  # Slope
-c = model.intercept_  # Intercept
-print(f"Equation of the Line: Salary = {m:.2f} * Experience + {c:.2f}")
+import os
+
+from model_cache import LinearPredictor, load_artifact, save_artifact
+
+DATA_PATH = r"C:\Users\sanji\Downloads\Salary_dataset.csv"
+MODEL_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "salary_model.json")
+
+
+def train():
+    # Heavy imports only happen when the model has to be retrained
+    import numpy as np
+    import pandas as pd
+    from sklearn.model_selection import train_test_split
+    from sklearn.linear_model import LinearRegression
+    from sklearn.metrics import mean_absolute_error, mean_squared_error
+
+    # Load dataset
+    df = pd.read_csv(DATA_PATH)
+    df = df.drop('Unnamed: 0', axis=1)
+
+    # Prepare data
+    X = df[["YearsExperience"]]  # Independent variable
+    y = df["Salary"]  # Dependent variable
+
+    # Split into training and testing sets
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
+
+    # Train Linear Regression model
+    model = LinearRegression()
+    model.fit(X_train, y_train)
+
+    # Get parameters
+    c = model.intercept_  # Intercept
+
+    # Evaluate the model
+    y_pred = model.predict(X_test)
+    mae = mean_absolute_error(y_test, y_pred)
+    mse = mean_squared_error(y_test, y_pred)
+    rmse = np.sqrt(mse)
 
-# Predictions
-y_pred = model.predict(X_test)
+    save_artifact(MODEL_PATH, DATA_PATH, model.coef_, c,
+                  metrics={"mae": mae, "rmse": rmse},
+                  features=["YearsExperience"], rows=len(df))
+
+    # Plotted by the caller once the results are printed
+    return X_train, y_train, X_test, y_test, X, model.predict(X)
+
+
+def plot(X_train, y_train, X_test, y_test, X, line):
+    import matplotlib.pyplot as plt
+
+    # Plot results
+    plt.scatter(X_train, y_train, color='blue', label="Training Data")
+    plt.scatter(X_test, y_test, color='red', label="Testing Data")
+    plt.plot(X, line, color='green', linewidth=2, label="Regression Line")
+    plt.xlabel("Years of Experience")
+    plt.ylabel("Salary")
+    plt.title("Salary Prediction using Linear Regression")
+    plt.legend()
+    plt.show()
+
+
+# Reuse the saved model unless the dataset has changed since it was trained
+artifact = load_artifact(MODEL_PATH, DATA_PATH)
+plot_data = None
+if artifact is None:
+    plot_data = train()
+    artifact = load_artifact(MODEL_PATH)
+predictor = LinearPredictor(artifact["coef"], artifact["intercept"])
+
+# Printed from the artifact so the output is the same with or without a retrain
+m, c = artifact["coef"][0], artifact["intercept"]
+print(f"Equation of the Line: Salary = {m:.2f} * Experience + {c:.2f}")
 
 # Predict salary for 10 years of experience
-experience = np.array([[10]])
-predicted_salary = model.predict(experience)
-print(f"Predicted Salary for 10 Years Experience: ${predicted_salary[0]:,.2f}")
-
-# Evaluate the model
-mae = mean_absolute_error(y_test, y_pred)
-mse = mean_squared_error(y_test, y_pred)
-rmse = np.sqrt(mse)
-
-print(f"Mean Absolute Error: {mae:.2f}")
-print(f"Root Mean Squared Error: {rmse:.2f}")
-
-# Plot results
-plt.scatter(X_train, y_train, color='blue', label="Training Data")
-plt.scatter(X_test, y_test, color='red', label="Testing Data")
-plt.plot(X, model.predict(X), color='green', linewidth=2, label="Regression Line")
-plt.xlabel("Years of Experience")
-plt.ylabel("Salary")
-plt.title("Salary Prediction using Linear Regression")
-plt.legend()
-plt.show()
+predicted_salary = predictor.predict_one(10)
+print(f"Predicted Salary for 10 Years Experience: ${predicted_salary:,.2f}")
+
+print(f"Mean Absolute Error: {artifact['metrics']['mae']:.2f}")
+print(f"Root Mean Squared Error: {artifact['metrics']['rmse']:.2f}")
+
+if plot_data is not None:
+    plot(*plot_data)
@@ -1,24 +1,12 @@
-import numpy as np
-import pandas as pd
+from batch_predict import predict_csv, print_stats
+from streaming_fit import fit_csv
 
-# Load dataset
-data = pd.read_csv(r"C:\Users\sanji\Downloads\Salary_dataset.csv")
-data = data.drop('Unnamed: 0', axis=1)
+DATA_PATH = r"C:\Users\sanji\Downloads\Salary_dataset.csv"
 
-# Prepare data
-y = data['Salary']
-X = data['YearsExperience']
-
-# Compute parameters manually
-n = len(X)
-sum_X = X.sum()
-sum_y = y.sum()
-sum_Xy = (X * y).sum()
-sum_X_squared = (X ** 2).sum()
-
-# Compute Slope (m) and Intercept (c)
-m = (n * sum_Xy - sum_X * sum_y) / (n * sum_X_squared - sum_X ** 2)
-c = (sum_y - m * sum_X) / n
+# Compute parameters manually. The sums are collected chunk by chunk, so the
+# fit works on files that do not fit in memory (pass workers=N to split it).
+acc = fit_csv(DATA_PATH, x_cols=["YearsExperience"], y_col="Salary")
+m, c = acc.slope_intercept()
 
 # Display the equation
 print(f"Equation: Salary = {m:.2f} * Experience + {c:.2f}")
@@ -29,6 +17,9 @@ predicted_salary = m * experience + c
 print(f"Predicted Salary for 10 Years Experience: ${predicted_salary:,.2f}")
 
 # Save predictions
-data['Predicted_Salary'] = m * data['YearsExperience'] + c
-data.to_csv("salary_predictions.csv", index=False)
+# Rows are scored and written chunk by chunk; pass workers=N to use a process
+# pool, or an .npy/.parquet output path for a compact binary file.
+stats = predict_csv(DATA_PATH, "salary_predictions.csv", m, c,
+                    x_cols=["YearsExperience"], drop_cols=["", "Unnamed: 0"])
 print("Predictions saved to salary_predictions.csv")
+print_stats(stats)
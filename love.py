@@ -1,9 +1,16 @@
-import numpy as np
-import matplotlib.pyplot as plt
-t = np.linspace(0, 2*np.pi, 100)
-x = 16*np.sin(t)**3
-y = 13*np.cos(t) - 5*np.cos(2*t) - 2*np.cos(3*t) - np.cos(4*t)
-plt.plot(x, y, 'red')
-plt.axis("equal")
-plt.axis("off")
-plt.show()
+import sys
+
+from curves import HEART, adaptive_sample, render
+
+# python love.py           -> show the heart in a window
+# python love.py heart.png -> write it to a file without a display
+t, x, y = adaptive_sample(HEART)
+if len(sys.argv) > 1:
+    render(x, y, sys.argv[1])
+else:
+    import matplotlib.pyplot as plt
+
+    plt.plot(x, y, 'red')
+    plt.axis("equal")
+    plt.axis("off")
+    plt.show()
@@ -0,0 +1,171 @@
+import os
+import sys
+import time
+from multiprocessing import Barrier, Process, shared_memory
+
+import numpy as np
+
+from poisson_solver import EPSILON_0, SolveResult, point_charge, solve
+
+# Domain-decomposed Jacobi / red-black SOR for the Poisson problem in
+# poisson_solver.py. The grid lives in shared memory and is cut into slabs of
+# x-planes, one per worker. A worker only writes its own planes; the halo
+# planes it needs from its neighbours are read straight from shared memory
+# after the barrier that ends each sweep (or colour), so every sweep matches
+# the serial solver's.
+
+CHECK_EVERY = {"jacobi": 50, "sor": 10}
+
+
+def _attach(name, shape):
+    shm = shared_memory.SharedMemory(name=name)
+    return shm, np.ndarray(shape, dtype=np.float64, buffer=shm.buf)
+
+
+def _slab_sum(V, lo, hi, out):
+    # six-point stencil for the full-grid x planes lo..hi-1
+    np.add(V[lo - 1:hi - 1, 1:-1, 1:-1], V[lo + 1:hi + 1, 1:-1, 1:-1], out=out)
+    out += V[lo:hi, :-2, 1:-1]
+    out += V[lo:hi, 2:, 1:-1]
+    out += V[lo:hi, 1:-1, :-2]
+    out += V[lo:hi, 1:-1, 2:]
+    return out
+
+
+def _worker(rank, n_workers, names, shape, lo, hi, method, h, omega, f_norm,
+            tol, max_iter, check_every, barrier):
+    v_shm, V = _attach(names["V"], shape)
+    f_shm, f = _attach(names["f"], shape)
+    p_shm, partial = _attach(names["partial"], (n_workers + 2,))
+    slab = V[lo:hi, 1:-1, 1:-1]
+    try:
+        buf = np.empty_like(slab)
+        h2f = f[lo:hi, 1:-1, 1:-1] * (h * h)
+        # same colouring as the serial solver, which counts interior indices
+        i, j, k = np.indices(slab.shape)
+        red = (i + (lo - 1) + j + k) % 2 == 0
+        masks = (red, ~red)
+
+        it = 0
+        while True:
+            # collective residual check: every worker sums the same partials
+            _slab_sum(V, lo, hi, buf)
+            buf -= 6 * slab
+            buf /= h * h
+            buf += f[lo:hi, 1:-1, 1:-1]
+            partial[rank] = np.vdot(buf, buf)
+            barrier.wait()
+            res = np.sqrt(partial[:n_workers].sum())
+            res = res / f_norm if f_norm else res
+            barrier.wait()  # partials are read before anyone overwrites them
+            if res <= tol or it >= max_iter:
+                break
+
+            for _ in range(min(check_every, max_iter - it)):
+                if method == "jacobi":
+                    _slab_sum(V, lo, hi, buf)
+                    buf += h2f
+                    buf /= 6
+                    barrier.wait()  # every slab has read the old V
+                    slab[...] = buf
+                    barrier.wait()  # every slab has written the new V
+                else:
+                    for mask in masks:
+                        _slab_sum(V, lo, hi, buf)
+                        buf += h2f
+                        buf /= 6
+                        buf -= slab
+                        buf *= omega
+                        np.add(slab, buf, out=slab, where=mask)
+                        barrier.wait()
+                it += 1
+
+        if rank == 0:
+            partial[n_workers] = it
+            partial[n_workers + 1] = res
+    finally:
+        del V, f, partial, slab
+        for shm in (v_shm, f_shm, p_shm):
+            shm.close()
+
+
+def _shared_copy(array, shms):
+    shm = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+    shms.append(shm)
+    view = np.ndarray(array.shape, dtype=np.float64, buffer=shm.buf)
+    view[...] = array
+    return shm.name
+
+
+def solve_parallel(rho, epsilon=EPSILON_0, h=1.0, method="sor", workers=None, tol=1e-6,
+                   max_iter=100_000, check_every=None, omega=None, V0=None):
+    """Parallel counterpart of poisson_solver.solve for "jacobi" and "sor"."""
+    if method not in CHECK_EVERY:
+        raise ValueError(f"parallel solve supports {sorted(CHECK_EVERY)}, not {method!r}")
+    f = np.asarray(rho, dtype=np.float64) / epsilon
+    V = np.zeros_like(f) if V0 is None else np.asarray(V0, dtype=np.float64)
+    shape = f.shape
+    n_workers = max(1, min(workers or os.cpu_count() or 1, shape[0] - 2))
+    if method == "jacobi":
+        omega = 1.0
+    elif omega is None:
+        omega = 2 / (1 + np.sin(np.pi / (max(shape) - 1)))
+    check_every = check_every or CHECK_EVERY[method]
+    f_norm = float(np.linalg.norm(f[1:-1, 1:-1, 1:-1]))
+
+    shms = []
+    try:
+        names = {
+            "V": _shared_copy(V, shms),
+            "f": _shared_copy(f, shms),
+            "partial": _shared_copy(np.zeros(n_workers + 2), shms),
+        }
+        # split the interior planes 1..nx-2 as evenly as possible
+        bounds = np.linspace(1, shape[0] - 1, n_workers + 1).round().astype(int)
+        barrier = Barrier(n_workers)
+        procs = [
+            Process(target=_worker, args=(rank, n_workers, names, shape, bounds[rank], bounds[rank + 1],
+                                          method, h, omega, f_norm, tol, max_iter, check_every, barrier))
+            for rank in range(n_workers)
+        ]
+        start = time.perf_counter()
+        for p in procs:
+            p.start()
+        # if one worker dies the rest would wait on the barrier forever
+        while any(p.is_alive() for p in procs):
+            for p in procs:
+                p.join(0.05)
+                if p.exitcode not in (None, 0):
+                    barrier.abort()
+        elapsed = time.perf_counter() - start
+        failed = [p.exitcode for p in procs if p.exitcode != 0]
+        if failed:
+            raise RuntimeError(f"{len(failed)} solver worker(s) failed (exit codes {failed})")
+
+        V_out = np.ndarray(shape, dtype=np.float64, buffer=shms[0].buf).copy()
+        partial = np.ndarray((n_workers + 2,), dtype=np.float64, buffer=shms[2].buf)
+        return SolveResult(V_out, int(partial[n_workers]), float(partial[n_workers + 1]), elapsed, method)
+    finally:
+        for shm in shms:
+            shm.close()
+            shm.unlink()
+
+
+def benchmark(n=129, method="sor", max_workers=None, tol=1e-6):
+    max_workers = max_workers or os.cpu_count() or 1
+    rho = point_charge(n)
+    serial = solve(rho, method=method, tol=tol)
+    print(f"{n}^3 {method}: serial {serial.seconds:.2f}s, {serial.iterations} iterations")
+    print(f"{'workers':>8} {'seconds':>9} {'speedup':>8} {'max |dV|':>10}")
+    for w in range(1, max_workers + 1):
+        r = solve_parallel(rho, method=method, workers=w, tol=tol)
+        diff = np.abs(r.V - serial.V).max()
+        print(f"{w:>8} {r.seconds:>9.2f} {serial.seconds / r.seconds:>7.2f}x {diff:>10.2e}")
+
+
+if __name__ == "__main__":
+    # python poisson_parallel.py [grid size] [method] [max workers]
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 129
+    method = sys.argv[2] if len(sys.argv) > 2 else "sor"
+    max_workers = int(sys.argv[3]) if len(sys.argv) > 3 else None
+    benchmark(n, method, max_workers)
@@ -0,0 +1,261 @@
+import sys
+import time
+from typing import NamedTuple
+
+import numpy as np
+
+# Solvers for the 3D Poisson equation from untitled28.ipynb,
+#     -laplacian(V) = rho / epsilon
+# on a box with V = 0 (or whatever V already holds) on the boundary. With
+# grid spacing h the discrete equation at each interior point is
+#     (6 V - sum of the six neighbours) / h^2 = f,   f = rho / epsilon
+# and the notebook's loop is plain Jacobi with h = 1.
+
+EPSILON_0 = 8.85e-12
+
+
+class SolveResult(NamedTuple):
+    V: np.ndarray
+    iterations: int
+    residual: float  # ||f - A V|| / ||f||
+    seconds: float
+    method: str = ""  # what the iterations count: sweeps, or V-cycles for multigrid
+
+
+def _interior(a):
+    return a[1:-1, 1:-1, 1:-1]
+
+
+def _neighbour_sum(V, out):
+    # six-point stencil written into a preallocated interior-sized buffer
+    np.add(V[:-2, 1:-1, 1:-1], V[2:, 1:-1, 1:-1], out=out)
+    out += V[1:-1, :-2, 1:-1]
+    out += V[1:-1, 2:, 1:-1]
+    out += V[1:-1, 1:-1, :-2]
+    out += V[1:-1, 1:-1, 2:]
+    return out
+
+
+def residual(V, f, h=1.0, out=None):
+    """Interior residual f - A V (zero-padded to the full grid)."""
+    if out is None:
+        out = np.zeros_like(V)
+    r = _interior(out)
+    _neighbour_sum(V, r)
+    r -= 6 * _interior(V)
+    r /= h * h
+    r += _interior(f)
+    return out
+
+
+def residual_norm(V, f, h=1.0):
+    f_norm = np.linalg.norm(_interior(f))
+    r_norm = np.linalg.norm(_interior(residual(V, f, h)))
+    return r_norm / f_norm if f_norm else r_norm
+
+
+def jacobi(V, f, h=1.0, tol=1e-6, max_iter=100_000, check_every=50):
+    """Jacobi sweeps accumulated in one preallocated, contiguous buffer."""
+    V = np.array(V, dtype=np.float64)
+    V_int = _interior(V)
+    buf = np.empty_like(V_int)
+    h2f = _interior(f) * (h * h)
+    res = residual_norm(V, f, h)
+    it = 0
+    while it < max_iter and res > tol:
+        for _ in range(min(check_every, max_iter - it)):
+            # the whole stencil is evaluated before V is touched, so this is
+            # still a Jacobi step, just without the notebook's temporaries
+            _neighbour_sum(V, buf)
+            buf += h2f
+            buf /= 6
+            V_int[...] = buf
+            it += 1
+        res = residual_norm(V, f, h)
+    return V, it, res
+
+
+def _red_black_masks(shape):
+    i, j, k = np.indices(tuple(n - 2 for n in shape))
+    red = (i + j + k) % 2 == 0
+    return red, ~red
+
+
+def sor_sweep(V, h2f, omega, masks, buf):
+    """One red-black Gauss-Seidel (omega=1) or SOR sweep, updating V in place.
+
+    h2f is h^2 * f over the interior.
+    """
+    V_int = _interior(V)
+    for mask in masks:
+        _neighbour_sum(V, buf)
+        buf += h2f
+        buf /= 6
+        buf -= V_int
+        buf *= omega
+        np.add(V_int, buf, out=V_int, where=mask)
+
+
+def sor(V, f, h=1.0, omega=None, tol=1e-6, max_iter=100_000, check_every=10):
+    """Red-black SOR; omega defaults to the optimum for the model problem."""
+    V = np.array(V, dtype=np.float64)
+    if omega is None:
+        omega = 2 / (1 + np.sin(np.pi / (max(V.shape) - 1)))
+    masks = _red_black_masks(V.shape)
+    buf = np.empty_like(_interior(V))
+    h2f = _interior(f) * (h * h)
+    res = residual_norm(V, f, h)
+    it = 0
+    while it < max_iter and res > tol:
+        for _ in range(min(check_every, max_iter - it)):
+            sor_sweep(V, h2f, omega, masks, buf)
+            it += 1
+        res = residual_norm(V, f, h)
+    return V, it, res
+
+
+def _restrict(r):
+    # full weighting: [1/4, 1/2, 1/4] along each axis, then every other point
+    r = r.copy()
+    for axis in range(3):
+        r = np.moveaxis(r, axis, 0)
+        smoothed = r.copy()
+        smoothed[1:-1] = 0.25 * r[:-2] + 0.5 * r[1:-1] + 0.25 * r[2:]
+        r = np.moveaxis(smoothed, 0, axis)
+    coarse = r[::2, ::2, ::2].copy()
+    coarse[0, :, :] = coarse[-1, :, :] = 0
+    coarse[:, 0, :] = coarse[:, -1, :] = 0
+    coarse[:, :, 0] = coarse[:, :, -1] = 0
+    return coarse
+
+
+def _prolong(e, shape):
+    # trilinear interpolation, one axis at a time
+    out = np.zeros(shape)
+    out[::2, ::2, ::2] = e
+    out[1::2, ::2, ::2] = 0.5 * (out[:-1:2, ::2, ::2] + out[2::2, ::2, ::2])
+    out[:, 1::2, ::2] = 0.5 * (out[:, :-1:2, ::2] + out[:, 2::2, ::2])
+    out[:, :, 1::2] = 0.5 * (out[:, :, :-1:2] + out[:, :, 2::2])
+    return out
+
+
+def _can_coarsen(shape):
+    return all(n % 2 == 1 and n >= 5 for n in shape)
+
+
+class _Level:
+    __slots__ = ("masks", "buf", "r")
+
+    def __init__(self, shape):
+        self.masks = _red_black_masks(shape)
+        self.buf = np.empty(tuple(n - 2 for n in shape))
+        self.r = np.zeros(shape)
+
+
+def _v_cycle(V, f, h, levels, depth, pre, post, coarse_sweeps):
+    level = levels[depth]
+    h2f = _interior(f) * (h * h)
+    if depth == len(levels) - 1:
+        for _ in range(coarse_sweeps):
+            sor_sweep(V, h2f, 1.0, level.masks, level.buf)
+        return
+    for _ in range(pre):
+        sor_sweep(V, h2f, 1.0, level.masks, level.buf)
+    r_coarse = _restrict(residual(V, f, h, out=level.r))
+    e_coarse = np.zeros_like(r_coarse)
+    _v_cycle(e_coarse, r_coarse, 2 * h, levels, depth + 1, pre, post, coarse_sweeps)
+    V += _prolong(e_coarse, V.shape)
+    for _ in range(post):
+        sor_sweep(V, h2f, 1.0, level.masks, level.buf)
+
+
+def multigrid(V, f, h=1.0, tol=1e-6, max_cycles=100, pre=2, post=2, coarse_sweeps=50):
+    """Geometric multigrid V-cycles with red-black Gauss-Seidel smoothing.
+
+    Each grid dimension should be 2^k + 1 (33, 65, 129, 257, ...) so the grid
+    can be halved all the way down; other odd sizes coarsen as far as they
+    can and the coarsest grid is relaxed with plain sweeps. Grids that
+    cannot be halved even once (any even size) raise ValueError.
+    """
+    V = np.array(V, dtype=np.float64)
+    if not _can_coarsen(V.shape):
+        raise ValueError(f"multigrid needs odd grid sizes of at least 5, ideally 2^k + 1; "
+                         f"got {V.shape}, use sor instead")
+    shapes = [V.shape]
+    while _can_coarsen(shapes[-1]):
+        shapes.append(tuple((n - 1) // 2 + 1 for n in shapes[-1]))
+    levels = [_Level(shape) for shape in shapes]
+    res = residual_norm(V, f, h)
+    cycles = 0
+    while cycles < max_cycles and res > tol:
+        _v_cycle(V, f, h, levels, 0, pre, post, coarse_sweeps)
+        cycles += 1
+        res = residual_norm(V, f, h)
+    return V, cycles, res
+
+
+METHODS = {"jacobi": jacobi, "sor": sor, "multigrid": multigrid}
+
+
+def solve(rho, epsilon=EPSILON_0, h=1.0, method=None, tol=1e-6, V0=None, **options):
+    """Solve -laplacian(V) = rho / epsilon; V0 supplies the boundary values.
+
+    method defaults to multigrid, or to sor on grids multigrid cannot
+    coarsen (such as the notebook's 30^3); result.method says which ran.
+    """
+    f = np.asarray(rho, dtype=np.float64) / epsilon
+    V = np.zeros_like(f) if V0 is None else V0
+    if method is None:
+        method = "multigrid" if _can_coarsen(f.shape) else "sor"
+    start = time.perf_counter()
+    V, iterations, res = METHODS[method](V, f, h, tol=tol, **options)
+    return SolveResult(V, iterations, res, time.perf_counter() - start, method)
+
+
+def point_charge(n, charge=1e-9):
+    rho = np.zeros((n, n, n))
+    rho[n // 2, n // 2, n // 2] = charge
+    return rho
+
+
+def notebook_loop(rho, epsilon=EPSILON_0, tol=1e-6, max_iter=100_000, check_every=50):
+    # the loop from untitled28.ipynb, with a residual check bolted on
+    nx, ny, nz = rho.shape
+    V = np.zeros((nx, ny, nz))
+    f = rho / epsilon
+    start = time.perf_counter()
+    it = 0
+    res = residual_norm(V, f)
+    while it < max_iter and res > tol:
+        for _ in range(check_every):
+            V[1:-1, 1:-1, 1:-1] = (V[1:-1, 1:-1, :-2] + V[1:-1, 1:-1, 2:] +
+                                    V[1:-1, :-2, 1:-1] + V[1:-1, 2:, 1:-1] +
+                                    V[:-2, 1:-1, 1:-1] + V[2:, 1:-1, 1:-1] +
+                                    rho[1:-1, 1:-1, 1:-1] / epsilon) / 6
+        it += check_every
+        res = residual_norm(V, f)
+    return SolveResult(V, it, res, time.perf_counter() - start)
+
+
+def benchmark(sizes=(33, 65, 129), tol=1e-6, max_iter=5_000):
+    print(f"{'grid':>6} {'method':>10} {'iters':>8} {'residual':>10} {'seconds':>9}")
+    for n in sizes:
+        rho = point_charge(n)
+        results = {"notebook": notebook_loop(rho, tol=tol, max_iter=max_iter)}
+        for method in ("jacobi", "sor", "multigrid") if _can_coarsen(rho.shape) else ("jacobi", "sor"):
+            limit = {} if method == "multigrid" else {"max_iter": max_iter}
+            results[method] = solve(rho, method=method, tol=tol, **limit)
+        for name, r in results.items():
+            note = "" if r.residual <= tol else "  (stopped before tolerance)"
+            print(f"{n:>5}^3 {name:>10} {r.iterations:>8} {r.residual:>10.2e} {r.seconds:>9.3f}{note}")
+
+
+if __name__ == "__main__":
+    # pass "bench" (and optionally grid sizes) to compare with the notebook loop
+    if len(sys.argv) > 1 and sys.argv[1] == "bench":
+        sizes = tuple(int(n) for n in sys.argv[2:]) or (33, 65, 129)
+        benchmark(sizes)
+    else:
+        result = solve(point_charge(33))
+        print(f"{result.method}: {result.iterations} cycles, residual {result.residual:.2e}, "
+              f"{result.seconds:.3f}s, V max {result.V.max():.4f}")
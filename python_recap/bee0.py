@@ -1,3 +1,7 @@
+import sys
+
+from spelling_bee import WordIndex
+
 WORDS = {
     "PAIR": (4, 4),
     "HAIR": (4, 4),
@@ -23,5 +27,29 @@ def main():
             print(f"Good job! You scored {WORDS.pop(guess)}")
     print("That's the game!")
 
+
+def play(puzzle):
+    # a generated puzzle; guesses are scored from the precomputed word table
+    print("Welcome to Spelling Bee!")
+    print(f"Your letters are: {' '.join(puzzle.letters.upper())} (must use {puzzle.center.upper()})")
+    found, total = set(), 0
+    while len(found) < len(puzzle.words):
+        print(f"{len(puzzle.words) - len(found)} left! Score: {total}/{puzzle.max_score}")
+        guess = input("Guess a word: ").strip().lower()
+        if guess in found:
+            print("Already found")
+            continue
+        points, message = puzzle.check(guess)
+        if points:
+            found.add(guess)
+            total += points
+        print(f"{message} You scored {points}" if points else message)
+    print("That's the game!")
+
+
 if __name__ == "__main__":
-    main()
+    if len(sys.argv) > 1:
+        # python bee0.py WORDLIST: play a random puzzle from a dictionary file
+        play(WordIndex.load(sys.argv[1]).random_puzzle())
+    else:
+        main()
@@ -1,15 +1,89 @@
+import numbers
+import sys
+import time
+from typing import NamedTuple
+
+import numpy as np
+
 distances = {
     "Voyeger 1": 15200,
     "Voyeger 2": 12700,
     "New Horizons": 5200,
     "Cassini": 1400,
-    "Juno": 500   
+    "Juno": 500
+}
+
+
+class Unit(NamedTuple):
+    name: str
+    symbol: str
+    km: float  # how many kilometres one of this unit is
+
+
+UNITS = {
+    unit.symbol: unit
+    for unit in (
+        Unit("kilometre", "km", 1.0),
+        Unit("metre", "m", 1e-3),
+        Unit("mile", "mi", 1.609344),
+        Unit("astronomical unit", "au", 149_597_870.7),
+        Unit("light-second", "ls", 299_792.458),
+        Unit("light-year", "ly", 9_460_730_472_580.8),
+        Unit("parsec", "pc", 30_856_775_814_913.673),
+        # The numbers in `distances` are in the report's own unit: convert()
+        # has always turned them into km by multiplying by 1.0934. It is
+        # not the astronomical unit, whatever convert()'s argument is called.
+        Unit("report unit", "ru", 1.0934),
+    )
 }
+
+
 def main():
-    for distance in distances.keys():
-        print(f"{distance} is {convert(distances[distance])} km from Earth.")
+    write_report(list(distances.keys()), convert(np.array(list(distances.values()))))
+
 
 def convert(au):
-    return au * 1.0934
+    # report units to km; works on a single number or a whole NumPy array
+    return convert_units(au, "ru", "km")
+
+
+def convert_units(values, from_unit, to_unit):
+    """Convert between any two units in UNITS; scalars stay plain floats."""
+    factor = UNITS[from_unit].km / UNITS[to_unit].km
+    if isinstance(values, numbers.Real):  # includes NumPy scalars such as np.int64
+        return float(values) * factor
+    return np.asarray(values, dtype=np.float64) * factor
+
+
+def write_report(names, km, out=None, chunk_rows=100_000):
+    """Write one line per object, joining chunk_rows lines into each write."""
+    out = out or sys.stdout
+    km = np.asarray(km)
+    for start in range(0, len(names), chunk_rows):
+        # Python floats print exactly like the old loop
+        rows = zip(names[start:start + chunk_rows], km[start:start + chunk_rows].tolist())
+        out.write("".join([f"{name} is {value} km from Earth.\n" for name, value in rows]))
+
+
+def benchmark(n=1_000_000):
+    import os
+
+    names = [f"Probe {i}" for i in range(n)]
+    values = np.random.default_rng(0).uniform(1, 20_000, n)
+    with open(os.devnull, "w") as devnull:
+        start = time.perf_counter()
+        for name, value in zip(names, values.tolist()):
+            print(f"{name} is {value * 1.0934} km from Earth.", file=devnull)
+        old = time.perf_counter() - start
+
+        start = time.perf_counter()
+        write_report(names, convert(values), devnull)
+        new = time.perf_counter() - start
+    print(f"loop: {n / old:,.0f} rows/s, vectorized: {n / new:,.0f} rows/s ({old / new:.1f}x)")
+
+
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    if len(sys.argv) > 1 and sys.argv[1] == "bench":
+        benchmark()
+    else:
+        main()
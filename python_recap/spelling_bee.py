@@ -0,0 +1,216 @@
+import json
+import os
+import random
+import sys
+import time
+
+# Word index for Spelling Bee puzzles.
+#
+# Every dictionary word is reduced to a 26-bit mask of the letters it uses
+# and words are grouped by mask. A word can be spelled from a letter set
+# exactly when its mask is a subset of the set's mask, so a 7-letter puzzle
+# only has to look up the 64 subsets that contain the center letter instead
+# of scanning the dictionary. Pangrams are the words whose mask is the full
+# set. The grouped index is cached as JSON next to the dictionary file and
+# rebuilt only when that file changes.
+
+MIN_LENGTH = 4
+MAX_LETTERS = 7
+PANGRAM_BONUS = 7
+A = ord("a")
+
+
+def letter_mask(letters):
+    mask = 0
+    for ch in letters:
+        mask |= 1 << (ord(ch) - A)
+    return mask
+
+
+def mask_letters(mask):
+    return "".join(chr(A + i) for i in range(26) if mask >> i & 1)
+
+
+def score(word, pangram=False):
+    # 4-letter words score 1, longer words a point per letter
+    points = 1 if len(word) == MIN_LENGTH else len(word)
+    return points + PANGRAM_BONUS if pangram else points
+
+
+def _subsets(mask):
+    # every non-empty subset of mask, including mask itself
+    sub = mask
+    while sub:
+        yield sub
+        sub = (sub - 1) & mask
+
+
+class WordIndex:
+    def __init__(self, groups):
+        self.groups = groups  # {mask: [word, ...]}
+
+    def __len__(self):
+        return sum(map(len, self.groups.values()))
+
+    @classmethod
+    def from_words(cls, words):
+        groups = {}
+        for word in words:
+            word = word.strip().lower()
+            if len(word) < MIN_LENGTH or not word.isascii() or not word.isalpha():
+                continue
+            mask = letter_mask(word)
+            if mask.bit_count() <= MAX_LETTERS:
+                groups.setdefault(mask, []).append(word)
+        for words in groups.values():
+            words.sort()
+        return cls(groups)
+
+    @classmethod
+    def load(cls, path, cache_path=None):
+        """Index a word-per-line file, reusing the on-disk cache if it is current."""
+        cache_path = cache_path or path + ".beeidx"
+        stat = os.stat(path)
+        source = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+        try:
+            with open(cache_path, encoding="utf-8") as f:
+                saved = json.load(f)
+            if saved["source"] == source:
+                return cls(dict(zip(saved["masks"], saved["words"])))
+        except (OSError, ValueError, KeyError):
+            pass
+        with open(path, encoding="utf-8") as f:
+            index = cls.from_words(f)
+        try:
+            index.save(cache_path, source)
+        except OSError:
+            pass  # e.g. a read-only directory: run without the cache
+        return index
+
+    def save(self, cache_path, source):
+        tmp_path = cache_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"source": source, "masks": list(self.groups),
+                       "words": list(self.groups.values())}, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, cache_path)
+
+    def words_for(self, letters, center):
+        """All words spellable from letters that use center, as {word: score}."""
+        letters, center = letters.lower(), center.lower()
+        if not (letters + center).isascii() or not (letters + center).isalpha():
+            raise ValueError(f"letters must be A-Z, got {letters!r} and {center!r}")
+        full = letter_mask(letters)
+        center_bit = letter_mask(center)
+        if not full & center_bit:
+            raise ValueError(f"center letter {center!r} is not one of {letters!r}")
+        found = {}
+        for mask in _subsets(full):
+            if mask & center_bit:
+                for word in self.groups.get(mask, ()):
+                    found[word] = score(word, mask == full)
+        return found
+
+    def pangram_sets(self):
+        """Masks of every 7-letter set that has at least one pangram."""
+        return [mask for mask in self.groups if mask.bit_count() == MAX_LETTERS]
+
+    def puzzle(self, letters, center):
+        letters, center = letters.lower(), center.lower()
+        return Puzzle(letters, center, self.words_for(letters, center))
+
+    def random_puzzle(self, rng=random, min_words=20, tries=1000):
+        """A random puzzle with a pangram and, if possible, min_words answers."""
+        sets = self.pangram_sets()
+        if not sets:
+            raise ValueError("the dictionary has no 7-letter pangrams")
+        best = None
+        for _ in range(tries):
+            letters = mask_letters(rng.choice(sets))
+            puzzle = self.puzzle(letters, rng.choice(letters))
+            if len(puzzle.words) >= min_words:
+                return puzzle
+            if best is None or len(puzzle.words) > len(best.words):
+                best = puzzle
+        return best
+
+
+class Puzzle:
+    def __init__(self, letters, center, words):
+        self.letters = letters.lower()
+        self.center = center.lower()
+        self.words = words  # {word: score}, precomputed so guesses are dict lookups
+        self.pangrams = {w for w in words if len(set(w)) == len(set(self.letters))}
+        self.max_score = sum(words.values())
+
+    def check(self, guess):
+        """Return (score, message) for a guess; score is 0 when it is rejected."""
+        guess = guess.strip().lower()
+        points = self.words.get(guess)
+        if points is not None:
+            return points, "Pangram!" if guess in self.pangrams else "Good job!"
+        if len(guess) < MIN_LENGTH:
+            return 0, "Too short"
+        if self.center not in guess:
+            return 0, f"Missing center letter {self.center.upper()}"
+        if not set(guess) <= set(self.letters):
+            return 0, "Bad letters"
+        return 0, "Not in word list"
+
+
+def benchmark(n_words=300_000, n_puzzles=2000):
+    import tempfile
+
+    rng = random.Random(0)
+    # rough English letter frequencies, so letter sets overlap like real words
+    weights = [8.2, 1.5, 2.8, 4.3, 12.7, 2.2, 2.0, 6.1, 7.0, 0.15, 0.77, 4.0, 2.4,
+               6.7, 7.5, 1.9, 0.1, 6.0, 6.3, 9.1, 2.8, 1.0, 2.4, 0.15, 2.0, 0.07]
+    alphabet = [chr(A + i) for i in range(26)]
+    words = {"".join(rng.choices(alphabet, weights, k=rng.randint(4, 12))) for _ in range(n_words)}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "words.txt")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("\n".join(words))
+
+        start = time.perf_counter()
+        index = WordIndex.load(path)
+        build = time.perf_counter() - start
+        start = time.perf_counter()
+        index = WordIndex.load(path)
+        cached = time.perf_counter() - start
+        print(f"{len(words):,} words, {len(index):,} playable: build {build * 1000:.0f} ms, "
+              f"cached startup {cached * 1000:.0f} ms")
+
+    sets = index.pangram_sets()
+    start = time.perf_counter()
+    for _ in range(n_puzzles):
+        letters = mask_letters(rng.choice(sets))
+        puzzle = index.puzzle(letters, rng.choice(letters))
+    elapsed = time.perf_counter() - start
+    print(f"puzzles: {n_puzzles / elapsed:,.0f}/s ({elapsed / n_puzzles * 1000:.3f} ms each)")
+
+    start = time.perf_counter()
+    letters = puzzle.letters
+    scan = {w for w in words if len(w) >= MIN_LENGTH and puzzle.center in w and set(w) <= set(letters)}
+    print(f"full dictionary scan for one puzzle: {(time.perf_counter() - start) * 1000:.0f} ms")
+    assert scan == set(puzzle.words)
+
+    guesses = list(puzzle.words) + ["zzzz"] * len(puzzle.words)
+    start = time.perf_counter()
+    for guess in guesses:
+        puzzle.check(guess)
+    elapsed = time.perf_counter() - start
+    print(f"guess checks: {len(guesses) / elapsed:,.0f}/s")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "bench":
+        benchmark()
+    elif len(sys.argv) > 1:
+        puzzle = WordIndex.load(sys.argv[1]).random_puzzle()
+        print(f"letters: {puzzle.letters.upper()}  center: {puzzle.center.upper()}")
+        print(f"{len(puzzle.words)} words, {len(puzzle.pangrams)} pangrams, {puzzle.max_score} points")
+    else:
+        print("usage: spelling_bee.py WORDLIST | bench")
@@ -0,0 +1,323 @@
+import json
+import mmap
+import os
+import sys
+import time
+from typing import NamedTuple
+
+# Typed, indexed access to the "|"-delimited files in data/.
+#
+# Each file gets a NamedTuple schema. Lookups go through an on-disk index
+# ({field: {value: byte offset}}) and read the one line they need from a
+# memory map of the data file. Appends are buffered and written in batches
+# with a single write + fsync; the data file is only ever appended to.
+# The index is saved (atomically, via rename) on close. If a process stops
+# before that, the next open indexes only the lines past the saved size.
+# A lookup whose offset no longer holds the requested key (the file was
+# rewritten by another tool) rebuilds the index from scratch.
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+
+
+class Administrator(NamedTuple):
+    id: str
+    username: str
+    password_hash: str
+    name: str
+
+
+class Driver(NamedTuple):
+    id: str
+    username: str
+    password_hash: str
+    name: str
+    phone: str
+    license: str
+    lat: float
+    lon: float
+
+
+# customers.txt and bookings.txt are still empty, so their layouts follow
+# the drivers file and what a booking needs to reference.
+class Customer(NamedTuple):
+    id: str
+    username: str
+    password_hash: str
+    name: str
+    phone: str
+    email: str
+
+
+class Booking(NamedTuple):
+    id: str
+    customer_id: str
+    driver_id: str
+    pickup_lat: float
+    pickup_lon: float
+    dropoff_lat: float
+    dropoff_lon: float
+    fare: float
+    status: str
+    created_at: str
+
+
+SCHEMAS = {
+    "administrators": (Administrator, ("id", "username")),
+    "drivers": (Driver, ("id", "username")),
+    "customers": (Customer, ("id", "username")),
+    "bookings": (Booking, ("id",)),
+}
+
+
+def parse_record(record_type, line):
+    values = line.rstrip(b"\r\n").decode("utf-8").split("|")
+    if len(values) != len(record_type._fields):
+        raise ValueError(f"{record_type.__name__} expects {len(record_type._fields)} fields, got {len(values)}")
+    types = record_type.__annotations__
+    return record_type(*(types[name](v) for name, v in zip(record_type._fields, values)))
+
+
+def format_record(record):
+    values = [repr(v) if isinstance(v, float) else str(v) for v in record]
+    for v in values:
+        if "|" in v or "\n" in v:
+            raise ValueError(f"field value may not contain '|' or a newline: {v!r}")
+    return ("|".join(values) + "\n").encode("utf-8")
+
+
+class RecordStore:
+    def __init__(self, path, record_type, keys=("id",), batch_size=1000):
+        self.path = path
+        self.index_path = path + ".idx"
+        self.record_type = record_type
+        self.keys = keys
+        self.batch_size = batch_size
+        self._pending = []
+        self._pending_keys = {field: {} for field in keys}
+        if not os.path.exists(path):
+            open(path, "ab").close()
+        self._file = open(path, "ab")
+        self._load_index()
+        self._map()
+
+    # -- index -------------------------------------------------------------
+
+    def _load_index(self):
+        self.index = {field: {} for field in self.keys}
+        self.indexed_size = 0
+        try:
+            with open(self.index_path, encoding="utf-8") as f:
+                saved = json.load(f)
+            if saved["keys"] == list(self.keys) and saved["size"] <= os.path.getsize(self.path):
+                self.index = saved["index"]
+                self.indexed_size = saved["size"]
+        except (OSError, ValueError, KeyError):
+            pass
+        self._index_tail()
+
+    def _index_tail(self):
+        # index complete lines written after the saved index (or all of them)
+        positions = {field: self.record_type._fields.index(field) for field in self.keys}
+        with open(self.path, "rb") as f:
+            f.seek(self.indexed_size)
+            offset = self.indexed_size
+            for line in f:
+                if not line.endswith(b"\n") and not self._complete(line):
+                    break  # a torn last line from an interrupted write
+                values = line.rstrip(b"\r\n").decode("utf-8").split("|")
+                if len(values) == len(self.record_type._fields):
+                    for field, pos in positions.items():
+                        self.index[field][values[pos]] = offset
+                offset += len(line)
+        self.indexed_size = offset
+
+    def _complete(self, line):
+        # a last line without a newline (common in hand-edited files) still
+        # counts if it holds a whole record
+        try:
+            parse_record(self.record_type, line)
+        except (ValueError, UnicodeDecodeError):
+            return False
+        return True
+
+    def _rebuild_index(self):
+        self.index = {field: {} for field in self.keys}
+        self.indexed_size = 0
+        self._index_tail()
+        if self._mm is not None:
+            self._mm.close()
+        self._map()
+
+    def save_index(self):
+        tmp_path = self.index_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"keys": list(self.keys), "size": self.indexed_size, "index": self.index}, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.index_path)
+
+    # -- reads -------------------------------------------------------------
+
+    def _map(self):
+        self._mm = None
+        if self.indexed_size:
+            with open(self.path, "rb") as f:
+                self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def _line_end(self, offset):
+        end = self._mm.find(b"\n", offset)
+        return len(self._mm) if end < 0 else end + 1
+
+    def _read_at(self, offset):
+        return parse_record(self.record_type, self._mm[offset:self._line_end(offset)])
+
+    def _read_checked(self, offset, field, value):
+        # None when the line at offset is not the indexed record, i.e. the
+        # file was rewritten by something else after the index was saved
+        if self._mm is None or offset >= len(self._mm):
+            return None
+        try:
+            record = self._read_at(offset)
+        except (ValueError, UnicodeDecodeError):
+            return None
+        return record if getattr(record, field) == value else None
+
+    def get(self, value, field="id"):
+        """O(1) lookup by any indexed field; returns None when missing."""
+        if field not in self.index:
+            raise KeyError(f"{field!r} is not indexed; indexed fields: {self.keys}")
+        pending = self._pending_keys[field].get(value)
+        if pending is not None:
+            return pending
+        offset = self.index[field].get(value)
+        if offset is None:
+            return None
+        record = self._read_checked(offset, field, value)
+        if record is None:
+            self._rebuild_index()
+            offset = self.index[field].get(value)
+            return None if offset is None else self._read_at(offset)
+        return record
+
+    def __contains__(self, value):
+        return self.get(value) is not None
+
+    def __len__(self):
+        return len(self.index[self.keys[0]]) + len(self._pending)
+
+    def __iter__(self):
+        self.flush()
+        mm = self._mm
+        if mm is None:
+            return
+        offset = 0
+        while offset < self.indexed_size:
+            end = self._line_end(offset)
+            line = mm[offset:end]
+            offset = end
+            if line.count(b"|") == len(self.record_type._fields) - 1:
+                yield parse_record(self.record_type, line)
+
+    # -- writes ------------------------------------------------------------
+
+    def append(self, record):
+        if not isinstance(record, self.record_type):
+            record = self.record_type(*record)
+        for field in self.keys:
+            value = getattr(record, field)
+            if value in self.index[field] or value in self._pending_keys[field]:
+                raise ValueError(f"{self.record_type.__name__} with {field}={value!r} already exists")
+        for field in self.keys:
+            self._pending_keys[field][getattr(record, field)] = record
+        self._pending.append(record)
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+    def extend(self, records):
+        for record in records:
+            self.append(record)
+
+    def flush(self):
+        """Write buffered records with one append and fsync."""
+        if not self._pending:
+            return
+        offset = os.path.getsize(self.path)
+        lines = [format_record(r) for r in self._pending]
+        prefix = b""
+        if offset and self._last_byte() != b"\n":
+            # start a fresh line after a torn write or a last line that
+            # was saved without a newline
+            prefix = b"\n"
+        self._file.write(prefix + b"".join(lines))
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+        offset += len(prefix)
+        for record, line in zip(self._pending, lines):
+            for field in self.keys:
+                self.index[field][getattr(record, field)] = offset
+            offset += len(line)
+        self.indexed_size = offset
+        self._pending = []
+        self._pending_keys = {field: {} for field in self.keys}
+        if self._mm is not None:
+            self._mm.close()
+        self._map()
+
+    def _last_byte(self):
+        with open(self.path, "rb") as f:
+            f.seek(-1, os.SEEK_END)
+            return f.read(1)
+
+    def close(self):
+        self.flush()
+        self.save_index()
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def open_store(name, data_dir=DATA_DIR, **options):
+    """Open one of the data/ files by name, e.g. open_store("drivers")."""
+    record_type, keys = SCHEMAS[name]
+    return RecordStore(os.path.join(data_dir, f"{name}.txt"), record_type, keys, **options)
+
+
+def benchmark(n=100_000, batch_size=1000):
+    import tempfile
+
+    with tempfile.TemporaryDirectory() as tmp:
+        start = time.perf_counter()
+        with open_store("bookings", tmp, batch_size=batch_size) as store:
+            for i in range(n):
+                store.append(Booking(f"B{i:07d}", f"C{i % 5000:05d}", f"D{i % 300:03d}",
+                                     40.75, -73.98, 40.70, -74.01, 18.5, "requested", "2026-01-01T00:00:00"))
+        elapsed = time.perf_counter() - start
+        print(f"append: {n:,} bookings in {elapsed:.2f}s ({n / elapsed:,.0f} writes/s, batch {batch_size})")
+
+        start = time.perf_counter()
+        store = open_store("bookings", tmp)
+        print(f"reopen with saved index: {(time.perf_counter() - start) * 1000:.1f} ms")
+        start = time.perf_counter()
+        for i in range(0, n, 7):
+            store.get(f"B{i:07d}")
+        lookups = len(range(0, n, 7))
+        elapsed = time.perf_counter() - start
+        print(f"lookup: {lookups / elapsed:,.0f} gets/s")
+        store.close()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "bench":
+        benchmark()
+    else:
+        with open_store("drivers") as drivers:
+            print(drivers.get("D002"))
+            print(drivers.get("driver3", field="username"))
@@ -0,0 +1,180 @@
+import csv
+import hashlib
+import re
+import sys
+import unicodedata
+import zlib
+from collections import Counter
+
+import numpy as np
+
+# Normalization and near-duplicate detection for the Bengali review corpus.
+# Exact duplicates (after normalization) are caught with a hash lookup; the
+# rest go through MinHash signatures bucketed with LSH, so each review is only
+# compared against a handful of candidates instead of the whole corpus.
+
+# zero-width joiner/non-joiner, zero-width space, BOM, soft hyphen
+_INVISIBLE_RE = re.compile("[\u200b\u200c\u200d\ufeff\u00ad]")
+# a space in front of a dependent sign (vowel sign, virama, nukta, anusvara,
+# visarga, candrabindu) is always a typo: those signs cannot start a word
+_SPACE_BEFORE_SIGN_RE = re.compile("\\s+(?=[\u0981-\u0983\u09bc\u09be-\u09cd\u09d7])")
+_SPACE_RE = re.compile(r"\s+")
+# runs of danda/double danda fold to one danda and repeated ? and ! collapse
+# to one, without a space in front. ASCII "." is left alone (Tk 300.00).
+_FULL_STOP_RE = re.compile("\\s*[\u0964\u0965]+")
+_REPEAT_MARK_RE = re.compile(r"\s*([?!])[?!]*")
+_BENGALI_DIGITS = {0x09e6 + d: str(d) for d in range(10)}
+
+
+def normalize_bengali(text):
+    """Readable normal form: NFC, no invisible characters, folded punctuation and spaces."""
+    text = unicodedata.normalize("NFC", text)
+    text = _INVISIBLE_RE.sub("", text)
+    text = text.translate(_BENGALI_DIGITS)
+    text = _SPACE_BEFORE_SIGN_RE.sub("", text)
+    text = _FULL_STOP_RE.sub("\u0964", text)
+    text = _REPEAT_MARK_RE.sub(r"\1", text)
+    return _SPACE_RE.sub(" ", text).strip()
+
+
+def dedup_key(text):
+    """Comparison form: normalized, lowercased, without punctuation or spaces.
+
+    Stray spaces inside words ("ব্যাং কের") are common in the corpus, so
+    whitespace is dropped entirely rather than collapsed.
+    """
+    text = normalize_bengali(text).lower()
+    return "".join(ch for ch in text if unicodedata.category(ch)[0] in "LMN")
+
+
+_PRIME = (1 << 31) - 1
+
+
+class DedupIndex:
+    """Incremental near-duplicate index.
+
+    Every added review either starts a new cluster or joins the cluster of an
+    earlier review. Only the first review of each cluster keeps its signature,
+    so memory grows with the number of unique reviews.
+    """
+
+    def __init__(self, num_perm=64, bands=16, threshold=0.7, shingle=3, seed=1):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        rng = np.random.default_rng(seed)
+        self.a = rng.integers(1, _PRIME, size=num_perm, dtype=np.uint64)
+        self.b = rng.integers(0, _PRIME, size=num_perm, dtype=np.uint64)
+        self.rows = num_perm // bands
+        self.bands = bands
+        self.threshold = threshold
+        self.shingle = shingle
+        self.exact = {}       # key hash -> representative id
+        self.buckets = {}     # (band, band bytes) -> [representative ids]
+        self.signatures = {}  # representative id -> signature
+        self.cluster_of = {}  # id -> representative id
+        self.labels = {}      # id -> label
+
+    def signature(self, key):
+        k = self.shingle
+        grams = {key[i:i + k] for i in range(max(len(key) - k + 1, 1))}
+        h = np.fromiter((zlib.crc32(g.encode("utf-8")) for g in grams), dtype=np.uint64, count=len(grams))
+        h %= _PRIME
+        return ((np.outer(self.a, h) + self.b[:, None]) % _PRIME).min(axis=1).astype(np.uint32)
+
+    def _band_keys(self, sig):
+        r = self.rows
+        return [(i, sig[i * r:(i + 1) * r].tobytes()) for i in range(self.bands)]
+
+    def add(self, doc_id, text, label=None):
+        """Index one review; returns the id of the cluster it belongs to."""
+        if doc_id in self.cluster_of:
+            raise KeyError(f"duplicate id: {doc_id}")
+        self.labels[doc_id] = label
+        key = dedup_key(text)
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        rep = self.exact.get(digest)
+        if rep is not None:
+            self.cluster_of[doc_id] = rep
+            return rep
+
+        sig = self.signature(key)
+        band_keys = self._band_keys(sig)
+        best, best_sim = None, self.threshold
+        seen = set()
+        for band_key in band_keys:
+            for cand in self.buckets.get(band_key, ()):
+                if cand in seen:
+                    continue
+                seen.add(cand)
+                sim = float(np.mean(self.signatures[cand] == sig))
+                if sim >= best_sim:
+                    best, best_sim = cand, sim
+
+        if best is not None:
+            self.exact[digest] = best
+            self.cluster_of[doc_id] = best
+            return best
+
+        self.exact[digest] = doc_id
+        self.cluster_of[doc_id] = doc_id
+        self.signatures[doc_id] = sig
+        for band_key in band_keys:
+            self.buckets.setdefault(band_key, []).append(doc_id)
+        return doc_id
+
+    def clusters(self):
+        groups = {}
+        for doc_id, rep in self.cluster_of.items():
+            groups.setdefault(rep, []).append(doc_id)
+        return groups
+
+    def stats(self):
+        sizes = Counter(self.cluster_of.values())
+        dup_clusters = [rep for rep, n in sizes.items() if n > 1]
+        conflicting = sum(
+            1 for members in self.clusters().values()
+            if len({self.labels[m] for m in members}) > 1
+        )
+        return {
+            "reviews": len(self.cluster_of),
+            "unique": len(sizes),
+            "duplicates": len(self.cluster_of) - len(sizes),
+            "duplicate_clusters": len(dup_clusters),
+            "largest_cluster": max(sizes.values(), default=0),
+            "conflicting_label_clusters": conflicting,
+        }
+
+
+def dedup_reviews(rows, **index_options):
+    """Deduplicate (id, sentiment, text) rows.
+
+    Returns the rows that start a cluster (the first occurrence, with
+    normalized text) and the index, whose stats() describe the clusters.
+    """
+    index = DedupIndex(**index_options)
+    kept = []
+    for doc_id, sentiment, text in rows:
+        if index.add(doc_id, text, sentiment) == doc_id:
+            kept.append((doc_id, sentiment, normalize_bengali(text)))
+    return kept, index
+
+
+if __name__ == "__main__":
+    from sentiment_cleaner import load_sample_corpus, parse_csv_text
+
+    if len(sys.argv) > 1:
+        with open(sys.argv[1], encoding="utf-8") as f:
+            text = f.read()
+    else:
+        text = load_sample_corpus()
+    kept, index = dedup_reviews(parse_csv_text(text))
+    if len(sys.argv) > 2:
+        with open(sys.argv[2], "w", encoding="utf-8", newline="") as f:
+            writer = csv.writer(f, lineterminator="\n")
+            writer.writerow(["id", "sentiment", "text"])
+            writer.writerows(kept)
+    for key, value in index.stats().items():
+        print(f"{key}: {value}")
+    for rep, members in index.clusters().items():
+        if len(members) > 1:
+            print(f"cluster {rep}: {', '.join(members)}")
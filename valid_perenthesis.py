@@ -1,3 +1,26 @@
+import re
+import sys
+import time
+from typing import BinaryIO, Iterable, NamedTuple, Optional, Union
+
+OPENERS = {"(": ")", "[": "]", "{": "}"}
+
+# Only brackets are interesting. bytes.translate drops everything else in C,
+# so the Python loop only runs over the (usually much shorter) bracket string.
+_NON_BRACKETS = bytes(b for b in range(256) if b not in b"()[]{}")
+_BRACKETS_STR = re.compile(r"[()\[\]{}]")
+_BRACKETS_BYTES = re.compile(rb"[()\[\]{}]")
+# keyed by both str and the ints produced by iterating over bytes
+_CLOSE_FOR = {**OPENERS, **{ord(o): ord(c) for o, c in OPENERS.items()}}
+
+
+class Mismatch(NamedTuple):
+    offset: int  # position in the input (bytes for byte input, characters for str)
+    kind: str  # "unexpected", "mismatch" or "unclosed"
+    found: str
+    expected: Optional[str]
+
+
 def balanced_parentheses(parentheses: str) -> bool:
     stack = []
     bracket_pairs = {"(": ")", "[": "]", "{": "}"}
@@ -11,6 +34,113 @@ def balanced_parentheses(parentheses: str) -> bool:
     return not stack
 
 
+def find_mismatch(data: Union[str, bytes, Iterable[Union[str, bytes]]]) -> Optional[Mismatch]:
+    """Return the first bracket error, or None if the input is balanced.
+
+    `data` may be a string, bytes, or an iterable of str or bytes chunks
+    (such as a file opened in binary mode), so large inputs never need to be
+    held in memory at once.
+
+    >>> find_mismatch("{(a)[b]}") is None
+    True
+    >>> find_mismatch("(a]")
+    Mismatch(offset=2, kind='mismatch', found=']', expected=')')
+    >>> find_mismatch(iter([b"x = {", b"1)"]))
+    Mismatch(offset=6, kind='mismatch', found=')', expected='}')
+    >>> find_mismatch("ok)")
+    Mismatch(offset=2, kind='unexpected', found=')', expected=None)
+    >>> find_mismatch("[[x]")
+    Mismatch(offset=0, kind='unclosed', found='[', expected=']')
+    """
+    if isinstance(data, (str, bytes)):
+        data = (data,)
+    stack = []  # closing bracket expected for each open one
+    base = 0
+    bottom = None  # where the outermost open bracket was pushed
+    for chunk in data:
+        if isinstance(chunk, str):
+            brackets = "".join(_BRACKETS_STR.findall(chunk))
+        else:
+            brackets = chunk.translate(None, _NON_BRACKETS)
+        saved = stack[:]
+        zero_at = -1 if not stack else None
+        for i, b in enumerate(brackets):
+            close = _CLOSE_FOR.get(b)
+            if close is not None:
+                stack.append(close)
+            elif not stack or stack.pop() != b:
+                # slow path: rescan this chunk only, now tracking offsets
+                return _locate(chunk, base, saved)
+            elif not stack:
+                zero_at = i
+        if stack and zero_at is not None:
+            bottom = (chunk, base, zero_at + 1)
+        base += len(chunk)
+    if stack:
+        # report the outermost bracket that was never closed
+        chunk, chunk_base, index = bottom
+        pattern = _BRACKETS_STR if isinstance(chunk, str) else _BRACKETS_BYTES
+        for i, m in enumerate(pattern.finditer(chunk)):
+            if i == index:
+                opener = _as_str(m.group())
+                return Mismatch(chunk_base + m.start(), "unclosed", opener, OPENERS[opener])
+    return None
+
+
+def _as_str(bracket):
+    return bracket.decode("ascii") if isinstance(bracket, bytes) else bracket
+
+
+def _locate(chunk, base, stack):
+    stack = [chr(c) if isinstance(c, int) else c for c in stack]
+    pattern = _BRACKETS_STR if isinstance(chunk, str) else _BRACKETS_BYTES
+    for m in pattern.finditer(chunk):
+        bracket = _as_str(m.group())
+        if bracket in OPENERS:
+            stack.append(OPENERS[bracket])
+        elif not stack:
+            return Mismatch(base + m.start(), "unexpected", bracket, None)
+        else:
+            expected = stack.pop()
+            if expected != bracket:
+                return Mismatch(base + m.start(), "mismatch", bracket, expected)
+    return None
+
+
+def _read_chunks(f: BinaryIO, chunk_size: int):
+    while True:
+        chunk = f.read(chunk_size)
+        if not chunk:
+            return
+        yield chunk
+
+
+def validate_file(path: str, chunk_size: int = 1 << 20) -> Optional[Mismatch]:
+    """Check a file of any size, reading it in binary chunks; offsets are in bytes."""
+    with open(path, "rb") as f:
+        return find_mismatch(_read_chunks(f, chunk_size))
+
+
+def benchmark(sizes=(10**4, 10**5, 10**6, 10**7)) -> None:
+    # a JSON-like payload: mostly text, with a nested bracket every few bytes
+    unit = '{"id": 12345, "tags": ["alpha", "beta"], "pos": (40.758, -73.9855)}, '
+    for size in sizes:
+        payload = "[" + unit * (size // len(unit)) + "]"
+        encoded = payload.encode()
+
+        start = time.perf_counter()
+        old = balanced_parentheses(payload)
+        old_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        new = find_mismatch(encoded[i:i + (1 << 20)] for i in range(0, len(encoded), 1 << 20))
+        new_time = time.perf_counter() - start
+
+        assert old == (new is None)
+        print(f"{len(encoded):>12,} bytes: old {len(encoded) / old_time / 1e6:8.1f} MB/s,"
+              f" new {len(encoded) / new_time / 1e6:8.1f} MB/s")
+
+
 if __name__ == "__main__":
     from doctest import testmod
 
@@ -18,3 +148,9 @@ if __name__ == "__main__":
     examples = ["((()))", "(())", "{(())}"]
     for example in examples:
         print(f"{example} is{'' if balanced_parentheses(example) else ' not'} balanced")
+
+    # pass a file path to validate it, or "bench" to time it against the old function
+    if len(sys.argv) > 1 and sys.argv[1] == "bench":
+        benchmark()
+    elif len(sys.argv) > 1:
+        print(validate_file(sys.argv[1]) or f"{sys.argv[1]} is balanced")